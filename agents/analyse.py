@@ -1,35 +1,12 @@
-import os
-import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-import json
-from google import genai
-from google.genai import types
+import orjson
+from config.ai import MODEL_FOR
 from prompts.prompt import default_prompt
-from utils.utils import extract_json_block
-from config.ai import client
+from agents.schemas import Section
+from utils.llm_cache import cached_generate
 
 
-def extract_sections(article_text: str):
-    """
-    Analyzes raw current-affairs content and extracts only UPSC-relevant sections.
-    
-    Filters and prioritizes sections based on UPSC importance:
-    - Returns 4-8 sections (prioritizing absolutely important ones)
-    - Filters out non-UPSC relevant content (local news, minor updates, etc.)
-    - Cleans content (removes ads, author bios, unrelated text)
-    
-    Returns:
-        List of dicts with keys: title, content, importance
-        - content: Array of strings, each string is a bullet point
-        Importance levels: "absolutely_important", "important", "moderately_important"
-    """
-
-    prompt = f"""
-Analyze the following current affairs article and extract ONLY the sections that are IMPORTANT for UPSC preparation.
-
-INPUT ARTICLE:
-{article_text}
+_PROMPT_PREFIX = """
+Analyze the current affairs article given at the end and extract ONLY the sections that are IMPORTANT for UPSC preparation.
 
 YOUR TASK:
 1. CRITICALLY ANALYZE each section for UPSC relevance
@@ -51,7 +28,7 @@ YOUR TASK:
 
 OUTPUT FORMAT (JSON ARRAY):
 [
-  {{
+  {
     "title": "India-Nepal Power Trade Agreement",
     "content": [
       "Point 1 explaining key aspect",
@@ -60,8 +37,8 @@ OUTPUT FORMAT (JSON ARRAY):
       "Point 4 with facts/figures"
     ],
     "importance": "absolutely_important"
-  }},
-  {{
+  },
+  {
     "title": "MSP Reform Proposal",
     "content": [
       "Point 1",
@@ -69,7 +46,7 @@ OUTPUT FORMAT (JSON ARRAY):
       "Point 3"
     ],
     "importance": "important"
-  }}
+  }
 ]
 
 CRITICAL RULES:
@@ -85,18 +62,41 @@ CRITICAL RULES:
 - Clean content thoroughly (remove ads, author info, navigation, etc.)
 - If article has fewer than 4 relevant sections, return only those
 - If article has more than 8 relevant sections, return only the top 8 most important
+
+INPUT ARTICLE:
 """
 
-    response = client.models.generate_content(
-        model="gemini-2.0-flash-lite",
-        config=types.GenerateContentConfig(system_instruction=default_prompt["analyse"]),
-        contents=prompt,
-    )
 
-    raw_text = response.text or ""
-    json_payload = extract_json_block(raw_text)
+def extract_sections(article_text: str, bypass_cache: bool = False):
+    """
+    Analyzes raw current-affairs content and extracts only UPSC-relevant sections.
+    
+    Filters and prioritizes sections based on UPSC importance:
+    - Returns 4-8 sections (prioritizing absolutely important ones)
+    - Filters out non-UPSC relevant content (local news, minor updates, etc.)
+    - Cleans content (removes ads, author bios, unrelated text)
+    
+    Args:
+        article_text: Scraped article text
+        bypass_cache: Ask the model even if a cached response exists
+    
+    Returns:
+        List of dicts with keys: title, content, importance
+        - content: Array of strings, each string is a bullet point
+        Importance levels: "absolutely_important", "important", "moderately_important"
+    """
+
+    prompt = _PROMPT_PREFIX + article_text
+
+    raw_text = cached_generate(
+        model=MODEL_FOR["analyse"],
+        system_instruction=default_prompt["analyse"],
+        prompt=prompt,
+        response_schema=list[Section],
+        bypass_cache=bypass_cache,
+    )
 
     try:
-        return json.loads(json_payload)
-    except json.JSONDecodeError as exc:
+        return orjson.loads(raw_text)
+    except orjson.JSONDecodeError as exc:
         raise ValueError("Model returned invalid JSON") from exc
@@ -0,0 +1,81 @@
+import orjson
+from config.ai import MODEL_FOR
+from prompts.prompt import default_prompt
+from agents.cards import CARD_EXAMPLE, CARD_RULES
+from agents.mindmap import MINDMAP_EXAMPLE, MINDMAP_RULES
+from agents.pyq import PYQ_EXAMPLE, PYQ_RULES, PYQ_STYLE_EXAMPLE
+from agents.schemas import SectionContentBatchItem
+from utils.utils import format_batch_contents, unpack_batch_response
+from utils.llm_cache import cached_generate
+
+
+# Each section costs roughly 1-2k output tokens (cards, a mind map and up to
+# 7 PYQs with explanations); three per call stays well inside the model's
+# 8192-token output limit, so larger days must be split across calls
+MAX_SECTIONS_PER_CALL = 3
+
+_PROMPT_PREFIX = f"""
+For EACH of the current-affairs content blocks given at the end, generate recall cards, a mind map, and UPSC-style Previous Year Questions (PYQ).
+
+OUTPUT FORMAT (JSON ARRAY, exactly one entry per content block):
+[
+  {{
+    "index": 0,
+    "cards": [
+      {CARD_EXAMPLE}
+    ],
+    "mindmap": {MINDMAP_EXAMPLE},
+    "pyq": {PYQ_EXAMPLE}
+  }}
+]
+
+RULES:
+- Produce ONLY valid JSON array - no markdown, no code fences, no explanations.
+- Return exactly one entry per content block; "index" must match the block's [index].
+- Everything in an entry must only be based on that block's content.
+
+CARD RULES:
+{CARD_RULES}
+
+MIND MAP RULES:
+{MINDMAP_RULES}
+
+PYQ RULES:
+{PYQ_RULES}
+
+{PYQ_STYLE_EXAMPLE}
+
+"""
+
+
+def generate_all(section_texts: list, bypass_cache: bool = False):
+    """
+    Generate cards, mindmaps and PYQs for every section in a single model call.
+
+    Args:
+        section_texts: List of section texts, at most MAX_SECTIONS_PER_CALL so
+                       the reply isn't truncated
+        bypass_cache: Ask the model even if a cached response exists
+
+    Returns:
+        Dict with "cards", "mindmaps" and "pyqs" lists, one entry per section, in input order
+
+    Raises:
+        ValueError: If the response is not valid JSON or misses a section
+    """
+    prompt = _PROMPT_PREFIX + format_batch_contents(section_texts)
+
+    raw_text = cached_generate(
+        model=MODEL_FOR["batch"],
+        system_instruction=default_prompt["all_content"],
+        prompt=prompt,
+        response_schema=list[SectionContentBatchItem],
+        bypass_cache=bypass_cache,
+    )
+    items = orjson.loads(raw_text)
+    count = len(section_texts)
+    return {
+        "cards": unpack_batch_response(items, key="cards", count=count),
+        "mindmaps": unpack_batch_response(items, key="mindmap", count=count),
+        "pyqs": unpack_batch_response(items, key="pyq", count=count),
+    }
@@ -1,33 +1,35 @@
-import os
-import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-import json
-import re
-from google import genai
-from google.genai import types
+import orjson
+from config.ai import MODEL_FOR
 from prompts.prompt import default_prompt
-from utils.utils import extract_json_block
+from agents.schemas import Card, CardsBatchItem
+from utils.utils import format_batch_contents, unpack_batch_response
+from utils.llm_cache import cached_generate
 
-from config.ai import client
 
-
-
-def create_cards(content: str):
-    prompt = f"""
-Generate high-quality recall cards from the following daily current-affairs content.
-
-CONTENT:
-{content}
-
-OUTPUT FORMAT (JSON ARRAY):
-[
-  {{
+CARD_EXAMPLE = """{
     "title": "India–Nepal Power Trade Agreement",
     "gs": "GS2 (IR), GS3 (Energy)",
     "tags": ["Hydropower", "Bilateral Relations", "Connectivity"],
     "summary": "3-4 line summary covering key points, facts, and significance.",
     "cta_buttons": "View Mind Map | View PYQs"
-  }},
+  }"""
+
+CARD_RULES = """- Create separate cards for each distinct topic/concept in the content.
+- Title should be clear and descriptive (max 100 characters).
+- GS field should list relevant GS papers (e.g., "GS2 (IR), GS3 (Energy)" or "GS2, GS3").
+- Tags should be an array of 3-5 relevant keywords.
+- Summary must be exactly 3-4 lines covering key points, facts, dates, numbers, and significance.
+- CTA buttons should always be exactly: "View Mind Map | View PYQs"
+- Cover all major topics, concepts, agreements, policies, and important facts from the content."""
+
+# Static instructions come first so every call shares a byte-identical
+# prefix; only the section content is appended per call.
+_PROMPT_PREFIX = f"""
+Generate high-quality recall cards from the daily current-affairs content given at the end.
+
+OUTPUT FORMAT (JSON ARRAY):
+[
+  {CARD_EXAMPLE},
   {{
     "title": "Another Topic Title",
     "gs": "GS2, GS3",
@@ -39,21 +41,67 @@ OUTPUT FORMAT (JSON ARRAY):
 
 RULES:
 - Produce ONLY valid JSON array - no markdown, no code fences, no explanations.
-- Create separate cards for each distinct topic/concept in the content.
-- Title should be clear and descriptive (max 100 characters).
-- GS field should list relevant GS papers (e.g., "GS2 (IR), GS3 (Energy)" or "GS2, GS3").
-- Tags should be an array of 3-5 relevant keywords.
-- Summary must be exactly 3-4 lines covering key points, facts, dates, numbers, and significance.
-- CTA buttons should always be exactly: "View Mind Map | View PYQs"
-- Cover all major topics, concepts, agreements, policies, and important facts from the content.
+{CARD_RULES}
+
+CONTENT:
+"""
+
+_BATCH_PROMPT_PREFIX = f"""
+Generate high-quality recall cards for EACH of the daily current-affairs content blocks given at the end.
+
+OUTPUT FORMAT (JSON ARRAY, exactly one entry per content block):
+[
+  {{
+    "index": 0,
+    "cards": [
+      {CARD_EXAMPLE}
+    ]
+  }}
+]
+
+RULES:
+- Produce ONLY valid JSON array - no markdown, no code fences, no explanations.
+- Return exactly one entry per content block; "index" must match the block's [index].
+- Cards for a block must only cover that block's content.
+{CARD_RULES}
+
 """
 
-    response = client.models.generate_content(
-        model="gemini-2.0-flash-lite",
-        config=types.GenerateContentConfig(system_instruction=default_prompt["recall_card"]),
-        contents=prompt,
+
+def create_cards(content: str, bypass_cache: bool = False):
+    prompt = _PROMPT_PREFIX + content
+
+    raw_text = cached_generate(
+        model=MODEL_FOR["cards"],
+        system_instruction=default_prompt["recall_card"],
+        prompt=prompt,
+        response_schema=list[Card],
+        bypass_cache=bypass_cache,
     )
+    return orjson.loads(raw_text)
+
 
-    raw_text = response.text or ""
-    json_payload = extract_json_block(raw_text)
-    return json.loads(json_payload)
+def create_cards_batch(contents: list, bypass_cache: bool = False):
+    """
+    Generate recall cards for several sections in a single model call.
+
+    Args:
+        contents: List of section texts
+        bypass_cache: Ask the model even if a cached response exists
+
+    Returns:
+        List of card lists, one per section, in input order
+
+    Raises:
+        ValueError: If the response is not valid JSON or misses a section
+    """
+    prompt = _BATCH_PROMPT_PREFIX + format_batch_contents(contents)
+
+    raw_text = cached_generate(
+        model=MODEL_FOR["cards"],
+        system_instruction=default_prompt["recall_card"],
+        prompt=prompt,
+        response_schema=list[CardsBatchItem],
+        bypass_cache=bypass_cache,
+    )
+    return unpack_batch_response(orjson.loads(raw_text), key="cards", count=len(contents))
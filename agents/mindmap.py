@@ -1,51 +1,98 @@
-import os
-import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-import json
-import re
-from google import genai
-from google.genai import types
+import orjson
+from config.ai import MODEL_FOR
 from prompts.prompt import default_prompt
-from config.ai import client
-from utils.utils import extract_json_block
+from agents.schemas import Mindmap, MindmapBatchItem
+from utils.utils import format_batch_contents, unpack_batch_response
+from utils.llm_cache import cached_generate
 
-def create_mindmap(content: str):
-    prompt = f"""
-Generate a hierarchical mind map from the following content.
 
-CONTENT:
-{content}
-
-OUTPUT FORMAT (MANDATORY JSON):
-{{
+MINDMAP_EXAMPLE = """{
   "title": "Main topic",
   "nodes": [
-    {{
+    {
       "name": "Subtopic 1",
       "children": [
-        {{ "name": "Point A" }},
-        {{ "name": "Point B" }}
+        { "name": "Point A" },
+        { "name": "Point B" }
       ]
-    }},
-    {{
+    },
+    {
       "name": "Subtopic 2",
       "children": [...]
-    }}
+    }
   ]
-}}
+}"""
+
+MINDMAP_RULES = """- Keep the hierarchy clean and 3 levels deep maximum.
+- Summarize but do NOT omit important concepts."""
+
+_PROMPT_PREFIX = f"""
+Generate a hierarchical mind map from the content given at the end.
+
+OUTPUT FORMAT (MANDATORY JSON):
+{MINDMAP_EXAMPLE}
+
+RULES:
+- Do NOT add extra text outside JSON.
+{MINDMAP_RULES}
+
+CONTENT:
+"""
+
+_BATCH_PROMPT_PREFIX = f"""
+Generate a hierarchical mind map for EACH of the content blocks given at the end.
+
+OUTPUT FORMAT (MANDATORY JSON ARRAY, exactly one entry per content block):
+[
+  {{
+    "index": 0,
+    "mindmap": {MINDMAP_EXAMPLE}
+  }}
+]
 
 RULES:
 - Do NOT add extra text outside JSON.
-- Keep the hierarchy clean and 3 levels deep maximum.
-- Summarize but do NOT omit important concepts.
+- Return exactly one entry per content block; "index" must match the block's [index].
+- Each mind map must only cover its own block's content.
+{MINDMAP_RULES}
+
 """
 
-    response = client.models.generate_content(
-        model="gemini-2.0-flash-lite",
-        config=types.GenerateContentConfig(system_instruction=default_prompt["mind_map"]),
-        contents=prompt,
+
+def create_mindmap(content: str, bypass_cache: bool = False):
+    prompt = _PROMPT_PREFIX + content
+
+    raw_text = cached_generate(
+        model=MODEL_FOR["mindmap"],
+        system_instruction=default_prompt["mind_map"],
+        prompt=prompt,
+        response_schema=Mindmap,
+        bypass_cache=bypass_cache,
     )
+    return orjson.loads(raw_text)
 
-    raw_text = response.text or ""
-    json_payload = extract_json_block(raw_text)
-    return json.loads(json_payload)
+
+def create_mindmap_batch(contents: list, bypass_cache: bool = False):
+    """
+    Generate one mind map per section in a single model call.
+
+    Args:
+        contents: List of section texts
+        bypass_cache: Ask the model even if a cached response exists
+
+    Returns:
+        List of mindmap dicts, one per section, in input order
+
+    Raises:
+        ValueError: If the response is not valid JSON or misses a section
+    """
+    prompt = _BATCH_PROMPT_PREFIX + format_batch_contents(contents)
+
+    raw_text = cached_generate(
+        model=MODEL_FOR["mindmap"],
+        system_instruction=default_prompt["mind_map"],
+        prompt=prompt,
+        response_schema=list[MindmapBatchItem],
+        bypass_cache=bypass_cache,
+    )
+    return unpack_batch_response(orjson.loads(raw_text), key="mindmap", count=len(contents))
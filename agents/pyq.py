@@ -1,39 +1,29 @@
-from config.ai import client
-from utils.utils import extract_json_block
+import orjson
+from config.ai import MODEL_FOR
 from prompts.prompt import default_prompt
-import os
-import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-import json
-from google.genai import types
+from agents.schemas import PYQ, PYQBatchItem
+from utils.utils import format_batch_contents, unpack_batch_response
+from utils.llm_cache import cached_generate
 
 
-def create_pyq(content: str):
-    prompt = f"""
-Generate UPSC-style Previous Year Questions (PYQ) based on the following current affairs content.
-
-CONTENT:
-{content}
-
-OUTPUT FORMAT (MANDATORY JSON):
-{{
+PYQ_EXAMPLE = """{
   "prelims": [
-    {{
+    {
       "question": "Question text in UPSC Prelims MCQ style",
-      "options": {{
+      "options": {
         "a": "Option A",
         "b": "Option B",
         "c": "Option C",
         "d": "Option D"
-      }},
+      },
       "correct_answer": "a",
       "explanation": "Brief explanation of why this answer is correct",
       "gs_paper": "GS1",
       "year": "2024"
-    }}
+    }
   ],
   "mains": [
-    {{
+    {
       "question": "Question text in UPSC Mains descriptive style",
       "type": "10 marks / 15 marks / 20 marks",
       "gs_paper": "GS2",
@@ -43,13 +33,11 @@ OUTPUT FORMAT (MANDATORY JSON):
         "Key point 2 for answer",
         "Key point 3 for answer"
       ]
-    }}
+    }
   ]
-}}
+}"""
 
-RULES:
-- Produce ONLY valid JSON - no markdown, no code fences, no explanations
-- Generate 2-4 Prelims questions (MCQ format with 4 options)
+PYQ_RULES = """- Generate 2-4 Prelims questions (MCQ format with 4 options)
 - Generate 1-3 Mains questions (descriptive/essay style)
 - Questions should test understanding, application, and analysis
 - Follow actual UPSC question style and difficulty
@@ -57,9 +45,9 @@ RULES:
 - Provide clear explanations for Prelims questions
 - Include key points/answer framework for Mains questions
 - Questions should be based on the content provided
-- Use realistic year values (2020-2025)
+- Use realistic year values (2020-2025)"""
 
-Example:
+PYQ_STYLE_EXAMPLE = """Example:
 Prelims:
 Q. Which of the following are the reasons for the occurrence of multi-drug resistance in microbial pathogens in India? (2019)
 
@@ -78,15 +66,79 @@ Select the correct answer using the code given below.
 (d) 2, 3 and 4
 
 Mains:
-Q. Can overuse and free availability of antibiotics without Doctor’s prescription, be contributors to the emergence of drug-resistant diseasesin India? What are the available mechanisms for monitoring and control? Critically discuss the various issues involved. (2014)
+Q. Can overuse and free availability of antibiotics without Doctor’s prescription, be contributors to the emergence of drug-resistant diseasesin India? What are the available mechanisms for monitoring and control? Critically discuss the various issues involved. (2014)"""
+
+_PROMPT_PREFIX = f"""
+Generate UPSC-style Previous Year Questions (PYQ) based on the current affairs content given at the end.
+
+OUTPUT FORMAT (MANDATORY JSON):
+{PYQ_EXAMPLE}
+
+RULES:
+- Produce ONLY valid JSON - no markdown, no code fences, no explanations
+{PYQ_RULES}
+
+{PYQ_STYLE_EXAMPLE}
+
+CONTENT:
 """
 
-    response = client.models.generate_content(
-        model="gemini-2.0-flash-lite",
-        config=types.GenerateContentConfig(system_instruction=default_prompt["pyq"]),
-        contents=prompt,
+_BATCH_PROMPT_PREFIX = f"""
+Generate UPSC-style Previous Year Questions (PYQ) for EACH of the current affairs content blocks given at the end.
+
+OUTPUT FORMAT (MANDATORY JSON ARRAY, exactly one entry per content block):
+[
+  {{
+    "index": 0,
+    "pyq": {PYQ_EXAMPLE}
+  }}
+]
+
+RULES:
+- Produce ONLY valid JSON - no markdown, no code fences, no explanations
+- Return exactly one entry per content block; "index" must match the block's [index]
+- Questions for a block must only be based on that block's content
+{PYQ_RULES}
+
+{PYQ_STYLE_EXAMPLE}
+
+"""
+
+
+def create_pyq(content: str, bypass_cache: bool = False):
+    prompt = _PROMPT_PREFIX + content
+
+    raw_text = cached_generate(
+        model=MODEL_FOR["pyq"],
+        system_instruction=default_prompt["pyq"],
+        prompt=prompt,
+        response_schema=PYQ,
+        bypass_cache=bypass_cache,
     )
+    return orjson.loads(raw_text)
+
+
+def create_pyq_batch(contents: list, bypass_cache: bool = False):
+    """
+    Generate PYQ-style questions for several sections in a single model call.
+
+    Args:
+        contents: List of section texts
+        bypass_cache: Ask the model even if a cached response exists
 
-    raw_text = response.text or ""
-    json_payload = extract_json_block(raw_text)
-    return json.loads(json_payload)
+    Returns:
+        List of PYQ dicts (with prelims and mains), one per section, in input order
+
+    Raises:
+        ValueError: If the response is not valid JSON or misses a section
+    """
+    prompt = _BATCH_PROMPT_PREFIX + format_batch_contents(contents)
+
+    raw_text = cached_generate(
+        model=MODEL_FOR["pyq"],
+        system_instruction=default_prompt["pyq"],
+        prompt=prompt,
+        response_schema=list[PYQBatchItem],
+        bypass_cache=bypass_cache,
+    )
+    return unpack_batch_response(orjson.loads(raw_text), key="pyq", count=len(contents))
@@ -1,58 +1,14 @@
-import os
-import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-import json
-from google import genai
-from google.genai import types
+import asyncio
+import orjson
+from config.ai import MODEL_FOR
 from prompts.prompt import default_prompt
-from utils.utils import extract_json_block
-from config.ai import client
+from agents.schemas import SectionsReview, CardsReview, MindmapReview, PYQReview
+from utils.utils import run_blocking
+from utils.llm_cache import cached_generate
 
 
-def review_and_correct_content(content_type: str, content: dict, original_text: str = None):
-    """
-    Review and correct content for accuracy, completeness, and UPSC relevance.
-    
-    Args:
-        content_type: Type of content - "sections", "cards", "mindmap", "pyq"
-        content: The content dictionary to review
-        original_text: Optional original text for reference
-        
-    Returns:
-        Corrected content dictionary with review notes
-    """
-    
-    if content_type == "sections":
-        return review_sections(content, original_text)
-    elif content_type == "cards":
-        return review_cards(content, original_text)
-    elif content_type == "mindmap":
-        return review_mindmap(content, original_text)
-    elif content_type == "pyq":
-        return review_pyq(content, original_text)
-    else:
-        raise ValueError(f"Unknown content type: {content_type}")
-
-
-def review_sections(sections: list, original_text: str = None):
-    """
-    Review and correct sections for accuracy and UPSC relevance.
-    
-    Args:
-        sections: List of section dictionaries
-        original_text: Original article text for reference
-        
-    Returns:
-        Dict with corrected sections and review notes
-    """
-    prompt = f"""
-You are an expert UPSC content reviewer. Review the following sections for accuracy, completeness, and UPSC relevance.
-
-ORIGINAL TEXT (for reference):
-{original_text[:2000] if original_text else "Not provided"}
-
-SECTIONS TO REVIEW (JSON):
-{json.dumps(sections, indent=2)}
+_SECTIONS_PROMPT_PREFIX = """
+You are an expert UPSC content reviewer. Review the sections given at the end for accuracy, completeness, and UPSC relevance.
 
 YOUR TASK:
 1. Check for factual accuracy (dates, names, numbers, events)
@@ -64,21 +20,21 @@ YOUR TASK:
 7. Improve clarity and structure where needed
 
 OUTPUT FORMAT (MANDATORY JSON):
-{{
+{
   "corrected_sections": [
-    {{
+    {
       "title": "Corrected section title",
       "content": ["Point 1", "Point 2", ...],
       "importance": "absolutely_important"
-    }}
+    }
   ],
-  "review_notes": {{
+  "review_notes": {
     "issues_found": ["Issue 1", "Issue 2"],
     "corrections_made": ["Correction 1", "Correction 2"],
     "accuracy_score": 0.95,
     "completeness_score": 1.0
-  }}
-}}
+  }
+}
 
 RULES:
 - Produce ONLY valid JSON - no markdown, no code fences, no explanations
@@ -87,157 +43,50 @@ RULES:
 - Ensure all facts are accurate and verifiable
 - Remove any non-UPSC relevant content
 - Improve clarity without changing meaning
-"""
-
-    response = client.models.generate_content(
-        model="gemini-2.0-flash-lite",
-        config=types.GenerateContentConfig(system_instruction=default_prompt.get("review", "")),
-        contents=prompt,
-    )
-
-    raw_text = response.text or ""
-    json_payload = extract_json_block(raw_text)
-    
-    if not json_payload:
-        # Fallback: return original content with error note
-        return {
-            "corrected_sections": sections,
-            "review_notes": {
-                "issues_found": ["Failed to parse review response"],
-                "corrections_made": [],
-                "accuracy_score": 0.0,
-                "completeness_score": 0.0
-            }
-        }
-    
-    try:
-        result = json.loads(json_payload)
-        return result
-    except json.JSONDecodeError:
-        return {
-            "corrected_sections": sections,
-            "review_notes": {
-                "issues_found": ["Invalid JSON in review response"],
-                "corrections_made": [],
-                "accuracy_score": 0.0,
-                "completeness_score": 0.0
-            }
-        }
-
-
-def review_cards(cards: list, original_text: str = None):
-    """
-    Review and correct cards for accuracy and quality.
-    
-    Args:
-        cards: List of card dictionaries
-        original_text: Original article text for reference
-        
-    Returns:
-        Dict with corrected cards and review notes
-    """
-    prompt = f"""
-You are an expert UPSC content reviewer. Review the following recall cards for accuracy, completeness, and quality.
 
-ORIGINAL TEXT (for reference):
-{original_text[:2000] if original_text else "Not provided"}
+"""
 
-CARDS TO REVIEW (JSON):
-{json.dumps(cards, indent=2)}
+_CARDS_PROMPT_PREFIX = """
+You are an expert UPSC content reviewer. Review the recall cards given at the end for accuracy, completeness, and quality.
 
 YOUR TASK:
 1. Verify factual accuracy (dates, names, numbers, events)
 2. Check GS paper tags are appropriate
 3. Ensure tags are relevant and accurate
 4. Validate summary is 3-4 lines and covers key points
-5. Verify CTA buttons format is correct
-6. Check title clarity and accuracy
-7. Ensure all required fields are present
-8. Correct any errors or improve quality
+5. Check title clarity and accuracy
+6. Ensure all required fields are present
+7. Correct any errors or improve quality
 
 OUTPUT FORMAT (MANDATORY JSON):
-{{
+{
   "corrected_cards": [
-    {{
+    {
       "title": "Corrected title",
       "gs": "GS2 (IR), GS3 (Energy)",
       "tags": ["Tag1", "Tag2", "Tag3"],
       "summary": "3-4 line corrected summary...",
-      "cta_buttons": "View Mind Map | View PYQs",
-      "section_index": 0,
-      "section_title": "..."
-    }}
+      "section_index": 0
+    }
   ],
-  "review_notes": {{
+  "review_notes": {
     "issues_found": ["Issue 1", "Issue 2"],
     "corrections_made": ["Correction 1", "Correction 2"],
     "accuracy_score": 0.95,
     "quality_score": 0.9
-  }}
-}}
+  }
+}
 
 RULES:
 - Produce ONLY valid JSON - no markdown, no code fences, no explanations
-- Maintain section_index and section_title if present
+- Maintain section_index if present
 - Ensure all facts are accurate
 - Keep summary exactly 3-4 lines
-- Preserve CTA buttons format
-"""
-
-    response = client.models.generate_content(
-        model="gemini-2.0-flash-lite",
-        config=types.GenerateContentConfig(system_instruction=default_prompt.get("review", "")),
-        contents=prompt,
-    )
-
-    raw_text = response.text or ""
-    json_payload = extract_json_block(raw_text)
-    
-    if not json_payload:
-        return {
-            "corrected_cards": cards,
-            "review_notes": {
-                "issues_found": ["Failed to parse review response"],
-                "corrections_made": [],
-                "accuracy_score": 0.0,
-                "quality_score": 0.0
-            }
-        }
-    
-    try:
-        result = json.loads(json_payload)
-        return result
-    except json.JSONDecodeError:
-        return {
-            "corrected_cards": cards,
-            "review_notes": {
-                "issues_found": ["Invalid JSON in review response"],
-                "corrections_made": [],
-                "accuracy_score": 0.0,
-                "quality_score": 0.0
-            }
-        }
-
-
-def review_mindmap(mindmap: dict, original_text: str = None):
-    """
-    Review and correct mindmap for accuracy and structure.
-    
-    Args:
-        mindmap: Mindmap dictionary
-        original_text: Original article text for reference
-        
-    Returns:
-        Dict with corrected mindmap and review notes
-    """
-    prompt = f"""
-You are an expert UPSC content reviewer. Review the following mindmap for accuracy, completeness, and structure.
 
-ORIGINAL TEXT (for reference):
-{original_text[:2000] if original_text else "Not provided"}
+"""
 
-MINDMAP TO REVIEW (JSON):
-{json.dumps(mindmap, indent=2)}
+_MINDMAP_PROMPT_PREFIX = """
+You are an expert UPSC content reviewer. Review the mindmap given at the end for accuracy, completeness, and structure.
 
 YOUR TASK:
 1. Verify factual accuracy of all nodes
@@ -248,91 +97,39 @@ YOUR TASK:
 6. Correct any errors or improve structure
 
 OUTPUT FORMAT (MANDATORY JSON):
-{{
-  "corrected_mindmap": {{
+{
+  "corrected_mindmap": {
     "title": "Corrected main topic",
     "nodes": [
-      {{
+      {
         "name": "Subtopic 1",
         "children": [
-          {{ "name": "Point A" }},
-          {{ "name": "Point B" }}
+          { "name": "Point A" },
+          { "name": "Point B" }
         ]
-      }}
+      }
     ],
-    "section_index": 0,
-    "section_title": "..."
-  }},
-  "review_notes": {{
+    "section_index": 0
+  },
+  "review_notes": {
     "issues_found": ["Issue 1", "Issue 2"],
     "corrections_made": ["Correction 1", "Correction 2"],
     "accuracy_score": 0.95,
     "structure_score": 0.9
-  }}
-}}
+  }
+}
 
 RULES:
 - Produce ONLY valid JSON - no markdown, no code fences, no explanations
-- Maintain section_index and section_title if present
+- Maintain section_index if present
 - Keep hierarchy to 3 levels maximum
 - Ensure all facts are accurate
 - Improve clarity without changing meaning
-"""
-
-    response = client.models.generate_content(
-        model="gemini-2.0-flash-lite",
-        config=types.GenerateContentConfig(system_instruction=default_prompt.get("review", "")),
-        contents=prompt,
-    )
-
-    raw_text = response.text or ""
-    json_payload = extract_json_block(raw_text)
-    
-    if not json_payload:
-        return {
-            "corrected_mindmap": mindmap,
-            "review_notes": {
-                "issues_found": ["Failed to parse review response"],
-                "corrections_made": [],
-                "accuracy_score": 0.0,
-                "structure_score": 0.0
-            }
-        }
-    
-    try:
-        result = json.loads(json_payload)
-        return result
-    except json.JSONDecodeError:
-        return {
-            "corrected_mindmap": mindmap,
-            "review_notes": {
-                "issues_found": ["Invalid JSON in review response"],
-                "corrections_made": [],
-                "accuracy_score": 0.0,
-                "structure_score": 0.0
-            }
-        }
-
-
-def review_pyq(pyq: dict, original_text: str = None):
-    """
-    Review and correct PYQ questions for accuracy and UPSC style.
-    
-    Args:
-        pyq: PYQ dictionary with prelims and mains
-        original_text: Original article text for reference
-        
-    Returns:
-        Dict with corrected PYQ and review notes
-    """
-    prompt = f"""
-You are an expert UPSC content reviewer. Review the following PYQ questions for accuracy, UPSC style compliance, and quality.
 
-ORIGINAL TEXT (for reference):
-{original_text[:2000] if original_text else "Not provided"}
+"""
 
-PYQ TO REVIEW (JSON):
-{json.dumps(pyq, indent=2)}
+_PYQ_PROMPT_PREFIX = """
+You are an expert UPSC content reviewer. Review the PYQ questions given at the end for accuracy, UPSC style compliance, and quality.
 
 YOUR TASK:
 1. Verify factual accuracy of all questions
@@ -345,92 +142,236 @@ YOUR TASK:
 8. Correct any errors or improve quality
 
 OUTPUT FORMAT (MANDATORY JSON):
-{{
-  "corrected_pyq": {{
+{
+  "corrected_pyq": {
     "prelims": [
-      {{
+      {
         "question": "Corrected question text",
-        "options": {{
+        "options": {
           "a": "Option A",
           "b": "Option B",
           "c": "Option C",
           "d": "Option D"
-        }},
+        },
         "correct_answer": "a",
         "explanation": "Corrected explanation",
         "gs_paper": "GS1",
         "year": "2024",
-        "section_index": 0,
-        "section_title": "..."
-      }}
+        "section_index": 0
+      }
     ],
     "mains": [
-      {{
+      {
         "question": "Corrected question text",
         "type": "10 marks",
         "gs_paper": "GS2",
         "year": "2024",
         "key_points": ["Point 1", "Point 2", ...],
-        "section_index": 0,
-        "section_title": "..."
-      }}
+        "section_index": 0
+      }
     ]
-  }},
-  "review_notes": {{
+  },
+  "review_notes": {
     "issues_found": ["Issue 1", "Issue 2"],
     "corrections_made": ["Correction 1", "Correction 2"],
     "accuracy_score": 0.95,
     "quality_score": 0.9
-  }}
-}}
+  }
+}
 
 RULES:
 - Produce ONLY valid JSON - no markdown, no code fences, no explanations
-- Maintain section_index and section_title if present
+- Maintain section_index if present
 - Ensure all facts are accurate
 - Follow UPSC question style exactly
 - Verify correct answers are actually correct
 - Improve clarity without changing meaning
+
 """
 
-    response = client.models.generate_content(
-        model="gemini-2.0-flash-lite",
-        config=types.GenerateContentConfig(system_instruction=default_prompt.get("review", "")),
-        contents=prompt,
+
+REFERENCE_TEXT_LIMIT = 1000  # characters of original text sent with each review
+
+# Fields the reviewer cannot improve: the CTA text is constant and section
+# titles are recoverable from section_index, so they are not sent and are
+# restored on the corrected items instead.
+_UNREVIEWED_FIELDS = ("cta_buttons", "section_title")
+
+
+def _truncate_reference(original_text: str = None) -> str:
+    """Cap the reference text, cutting at the last sentence boundary within the limit."""
+    if not original_text:
+        return "Not provided"
+    if len(original_text) <= REFERENCE_TEXT_LIMIT:
+        return original_text
+    cut = original_text.rfind(". ", 0, REFERENCE_TEXT_LIMIT)
+    return original_text[:cut + 1] if cut > 0 else original_text[:REFERENCE_TEXT_LIMIT]
+
+
+def _strip_unreviewed(items: list) -> list:
+    """Return copies of the items without the fields the reviewer does not need."""
+    return [
+        {key: value for key, value in item.items() if key not in _UNREVIEWED_FIELDS}
+        if isinstance(item, dict) else item
+        for item in items
+    ]
+
+
+def _restore_unreviewed(corrected: list, originals: list) -> list:
+    """Put stripped fields back on corrected items, matched by section_index."""
+    by_section = {}
+    for item in originals:
+        if isinstance(item, dict):
+            by_section.setdefault(
+                item.get("section_index"),
+                {key: item[key] for key in _UNREVIEWED_FIELDS if key in item},
+            )
+    for item in corrected:
+        if isinstance(item, dict):
+            for key, value in by_section.get(item.get("section_index"), {}).items():
+                item.setdefault(key, value)
+    return corrected
+
+
+def _build_prompt(prefix: str, label: str, content, original_text: str = None) -> str:
+    """Append the per-call reference text and content to a static review prompt prefix."""
+    return "".join([
+        prefix,
+        "ORIGINAL TEXT (for reference):\n",
+        _truncate_reference(original_text),
+        f"\n\n{label} TO REVIEW (JSON):\n",
+        orjson.dumps(content).decode(),
+        "\n",
+    ])
+
+
+def review_and_correct_content(content_type: str, content: dict, original_text: str = None):
+    """
+    Review and correct content for accuracy, completeness, and UPSC relevance.
+    
+    Args:
+        content_type: Type of content - "sections", "cards", "mindmap", "pyq"
+        content: The content dictionary to review
+        original_text: Optional original text for reference
+        
+    Returns:
+        Corrected content dictionary with review notes
+    """
+    
+    if content_type == "sections":
+        return review_sections(content, original_text)
+    elif content_type == "cards":
+        return review_cards(content, original_text)
+    elif content_type == "mindmap":
+        return review_mindmap(content, original_text)
+    elif content_type == "pyq":
+        return review_pyq(content, original_text)
+    else:
+        raise ValueError(f"Unknown content type: {content_type}")
+
+
+def review_sections(sections: list, original_text: str = None):
+    """
+    Review and correct sections for accuracy and UPSC relevance.
+    
+    Args:
+        sections: List of section dictionaries
+        original_text: Original article text for reference
+        
+    Returns:
+        Dict with corrected sections and review notes
+    """
+    prompt = _build_prompt(_SECTIONS_PROMPT_PREFIX, "SECTIONS", sections, original_text)
+
+    raw_text = cached_generate(
+        model=MODEL_FOR["review"],
+        system_instruction=default_prompt.get("review", ""),
+        prompt=prompt,
+        response_schema=SectionsReview,
+    )
+    return orjson.loads(raw_text)
+
+
+def review_cards(cards: list, original_text: str = None):
+    """
+    Review and correct cards for accuracy and quality.
+    
+    Args:
+        cards: List of card dictionaries
+        original_text: Original article text for reference
+        
+    Returns:
+        Dict with corrected cards and review notes
+    """
+    prompt = _build_prompt(_CARDS_PROMPT_PREFIX, "CARDS", _strip_unreviewed(cards), original_text)
+
+    raw_text = cached_generate(
+        model=MODEL_FOR["review"],
+        system_instruction=default_prompt.get("review", ""),
+        prompt=prompt,
+        response_schema=CardsReview,
     )
+    result = orjson.loads(raw_text)
+    _restore_unreviewed(result["corrected_cards"], cards)
+    return result
+
 
-    raw_text = response.text or ""
-    json_payload = extract_json_block(raw_text)
+def review_mindmap(mindmap: dict, original_text: str = None):
+    """
+    Review and correct mindmap for accuracy and structure.
     
-    if not json_payload:
-        return {
-            "corrected_pyq": pyq,
-            "review_notes": {
-                "issues_found": ["Failed to parse review response"],
-                "corrections_made": [],
-                "accuracy_score": 0.0,
-                "quality_score": 0.0
-            }
-        }
+    Args:
+        mindmap: Mindmap dictionary
+        original_text: Original article text for reference
+        
+    Returns:
+        Dict with corrected mindmap and review notes
+    """
+    prompt = _build_prompt(_MINDMAP_PROMPT_PREFIX, "MINDMAP", _strip_unreviewed([mindmap])[0], original_text)
+
+    raw_text = cached_generate(
+        model=MODEL_FOR["review"],
+        system_instruction=default_prompt.get("review", ""),
+        prompt=prompt,
+        response_schema=MindmapReview,
+    )
+    result = orjson.loads(raw_text)
+    _restore_unreviewed([result["corrected_mindmap"]], [mindmap])
+    return result
+
+
+def review_pyq(pyq: dict, original_text: str = None):
+    """
+    Review and correct PYQ questions for accuracy and UPSC style.
     
-    try:
-        result = json.loads(json_payload)
-        return result
-    except json.JSONDecodeError:
-        return {
-            "corrected_pyq": pyq,
-            "review_notes": {
-                "issues_found": ["Invalid JSON in review response"],
-                "corrections_made": [],
-                "accuracy_score": 0.0,
-                "quality_score": 0.0
-            }
-        }
-
-
-def review_all_content(sections: list, cards: list, mindmaps: list, pyq: dict, original_text: str = None):
+    Args:
+        pyq: PYQ dictionary with prelims and mains
+        original_text: Original article text for reference
+        
+    Returns:
+        Dict with corrected PYQ and review notes
+    """
+    payload = {
+        "prelims": _strip_unreviewed(pyq.get("prelims", [])),
+        "mains": _strip_unreviewed(pyq.get("mains", [])),
+    }
+    prompt = _build_prompt(_PYQ_PROMPT_PREFIX, "PYQ", payload, original_text)
+
+    raw_text = cached_generate(
+        model=MODEL_FOR["review"],
+        system_instruction=default_prompt.get("review", ""),
+        prompt=prompt,
+        response_schema=PYQReview,
+    )
+    result = orjson.loads(raw_text)
+    for kind in ("prelims", "mains"):
+        _restore_unreviewed(result["corrected_pyq"][kind], pyq.get(kind, []))
+    return result
+
+
+async def review_all_content(sections: list, cards: list, mindmaps: list, pyq: dict, original_text: str = None):
     """
-    Review and correct all content types at once.
+    Review and correct all content types concurrently.
     
     Args:
         sections: List of sections
@@ -442,45 +383,34 @@ def review_all_content(sections: list, cards: list, mindmaps: list, pyq: dict, o
     Returns:
         Dict with all corrected content and review summary
     """
-    results = {
-        "sections": review_sections(sections, original_text),
-        "cards": review_cards(cards, original_text),
-        "mindmaps": [],
-        "pyq": review_pyq(pyq, original_text),
-        "overall_review": {
-            "total_issues": 0,
-            "total_corrections": 0,
-            "average_accuracy": 0.0
-        }
-    }
-    
-    # Review each mindmap
-    for mindmap in mindmaps:
-        mindmap_result = review_mindmap(mindmap, original_text)
-        results["mindmaps"].append(mindmap_result)
-    
-    # Calculate overall metrics
-    all_notes = [
-        results["sections"]["review_notes"],
-        results["cards"]["review_notes"],
-        results["pyq"]["review_notes"]
-    ]
-    
-    for mindmap_result in results["mindmaps"]:
-        all_notes.append(mindmap_result["review_notes"])
-    
-    results["overall_review"]["total_issues"] = sum(
-        len(notes.get("issues_found", [])) for notes in all_notes
+    sections_result, cards_result, pyq_result, *mindmap_results = await asyncio.gather(
+        run_blocking(review_sections, sections, original_text),
+        run_blocking(review_cards, cards, original_text),
+        run_blocking(review_pyq, pyq, original_text),
+        *(run_blocking(review_mindmap, mindmap, original_text) for mindmap in mindmaps),
     )
-    results["overall_review"]["total_corrections"] = sum(
-        len(notes.get("corrections_made", [])) for notes in all_notes
-    )
-    
-    accuracy_scores = [
-        notes.get("accuracy_score", 0.0) for notes in all_notes
-    ]
-    if accuracy_scores:
-        results["overall_review"]["average_accuracy"] = sum(accuracy_scores) / len(accuracy_scores)
-    
-    return results
 
+    # Calculate overall metrics in a single pass over every agent's notes
+    total_issues = total_corrections = 0
+    accuracy_sum = 0.0
+    accuracy_count = 0
+    for result in (sections_result, cards_result, pyq_result, *mindmap_results):
+        notes = result["review_notes"]
+        total_issues += len(notes.get("issues_found", []))
+        total_corrections += len(notes.get("corrections_made", []))
+        accuracy = notes.get("accuracy_score")
+        if accuracy is not None:
+            accuracy_sum += accuracy
+            accuracy_count += 1
+
+    return {
+        "sections": sections_result,
+        "cards": cards_result,
+        "mindmaps": mindmap_results,
+        "pyq": pyq_result,
+        "overall_review": {
+            "total_issues": total_issues,
+            "total_corrections": total_corrections,
+            "average_accuracy": accuracy_sum / accuracy_count if accuracy_count else 0.0,
+        },
+    }
@@ -0,0 +1,154 @@
+from typing import List
+from pydantic import BaseModel
+
+
+# Response schemas passed to Gemini so every agent gets well-formed JSON back
+
+
+class Section(BaseModel):
+    title: str
+    content: List[str]
+    importance: str
+
+
+class Card(BaseModel):
+    title: str
+    gs: str
+    tags: List[str]
+    summary: str
+    cta_buttons: str
+
+
+class MindmapLeaf(BaseModel):
+    name: str
+
+
+class MindmapNode(BaseModel):
+    name: str
+    children: List[MindmapLeaf]
+
+
+class Mindmap(BaseModel):
+    title: str
+    nodes: List[MindmapNode]
+
+
+class PrelimsOptions(BaseModel):
+    a: str
+    b: str
+    c: str
+    d: str
+
+
+class PrelimsQuestion(BaseModel):
+    question: str
+    options: PrelimsOptions
+    correct_answer: str
+    explanation: str
+    gs_paper: str
+    year: str
+
+
+class MainsQuestion(BaseModel):
+    question: str
+    type: str
+    gs_paper: str
+    year: str
+    key_points: List[str]
+
+
+class PYQ(BaseModel):
+    prelims: List[PrelimsQuestion]
+    mains: List[MainsQuestion]
+
+
+# Batch responses: one indexed entry per content block
+
+
+class CardsBatchItem(BaseModel):
+    index: int
+    cards: List[Card]
+
+
+class MindmapBatchItem(BaseModel):
+    index: int
+    mindmap: Mindmap
+
+
+class PYQBatchItem(BaseModel):
+    index: int
+    pyq: PYQ
+
+
+class SectionContentBatchItem(BaseModel):
+    index: int
+    cards: List[Card]
+    mindmap: Mindmap
+    pyq: PYQ
+
+
+# Review responses: corrected items keep section_index; constant fields
+# (cta_buttons, section_title) are restored by the review agent
+
+
+class ReviewNotes(BaseModel):
+    issues_found: List[str]
+    corrections_made: List[str]
+    accuracy_score: float
+
+
+class SectionsReviewNotes(ReviewNotes):
+    completeness_score: float
+
+
+class QualityReviewNotes(ReviewNotes):
+    quality_score: float
+
+
+class StructureReviewNotes(ReviewNotes):
+    structure_score: float
+
+
+class ReviewedCard(BaseModel):
+    title: str
+    gs: str
+    tags: List[str]
+    summary: str
+    section_index: int
+
+
+class ReviewedMindmap(Mindmap):
+    section_index: int
+
+
+class ReviewedPrelimsQuestion(PrelimsQuestion):
+    section_index: int
+
+
+class ReviewedMainsQuestion(MainsQuestion):
+    section_index: int
+
+
+class ReviewedPYQ(BaseModel):
+    prelims: List[ReviewedPrelimsQuestion]
+    mains: List[ReviewedMainsQuestion]
+
+
+class SectionsReview(BaseModel):
+    corrected_sections: List[Section]
+    review_notes: SectionsReviewNotes
+
+
+class CardsReview(BaseModel):
+    corrected_cards: List[ReviewedCard]
+    review_notes: QualityReviewNotes
+
+
+class MindmapReview(BaseModel):
+    corrected_mindmap: ReviewedMindmap
+    review_notes: StructureReviewNotes
+
+
+class PYQReview(BaseModel):
+    corrected_pyq: ReviewedPYQ
+    review_notes: QualityReviewNotes
@@ -1,18 +1,110 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from scrap.scrap import scrape_article, scrape_all_articles
-from agents.cards import create_cards
-from agents.mindmap import create_mindmap
-from agents.pyq import create_pyq
-from agents.analyse import extract_sections
-from services.db_service import save_daily_content, get_daily_content, get_all_dates
-import json
+import asyncio
+import hashlib
+import orjson
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from services.db_service import (
+    CURRENT_CONTENT_TTL,
+    daily_content_exists,
+    get_daily_content,
+    get_all_dates,
+    iter_content_by_date_range,
+    list_dates,
+    list_summaries,
+    acquire_generation_lock,
+    release_generation_lock,
+)
 from services.content import generate_and_save_content as generate_and_save_content_task
 
 router = APIRouter()
 
+CONTENT_CACHE_CONTROL = "public, max-age=3600"
+# Today's content can still be regenerated, so clients only keep it briefly
+CURRENT_CONTENT_CACHE_CONTROL = f"public, max-age={CURRENT_CONTENT_TTL}"
+DATES_CACHE_CONTROL = "public, max-age=60"
+
+
+def _etag(value: str) -> str:
+    """Build a quoted ETag from a string that changes whenever the payload does."""
+    return f'"{hashlib.md5(value.encode()).hexdigest()}"'
+
+
+def _not_modified(request: Request, etag: str, cache_control: str):
+    """Return a 304 response if the client already holds this ETag, else None."""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    return None
+
+
+def _content_cache_control(date: str) -> str:
+    """Long-lived Cache-Control for past dates, short-lived for today and later."""
+    try:
+        is_past = datetime.strptime(date, "%d-%m-%Y").date() < datetime.now().date()
+    except ValueError:
+        is_past = False
+    return CONTENT_CACHE_CONTROL if is_past else CURRENT_CONTENT_CACHE_CONTROL
+
+
+def _validate_date(date: str):
+    """Reject dates that aren't "DD-MM-YYYY" with a 422 before any work is done."""
+    try:
+        datetime.strptime(date, "%d-%m-%Y")
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"Invalid date {date}, expected DD-MM-YYYY")
+
+
+# Status of generation jobs started by this process, keyed by date
+jobs = {}
+
+
+async def _run_generation(date: str, review: Optional[bool], force: bool):
+    """Run the generation pipeline for a date and record its outcome in jobs."""
+    jobs[date] = {"status": "running", "date": date}
+    try:
+        result = await generate_and_save_content_task(date=date, review=review, force=force)
+    except Exception as e:
+        jobs[date] = {"status": "failed", "date": date, "error": str(e)}
+        return
+    finally:
+        await asyncio.to_thread(release_generation_lock, date)
+    if result is None:
+        jobs[date] = {"status": "failed", "date": date, "error": "Content generation failed"}
+    else:
+        jobs[date] = {"status": "done", "date": date, "result": result}
+
+
+@router.get("/content")
+async def get_content_in_range(start_date: str, end_date: str,
+                               limit: Optional[int] = Query(None, ge=1, le=365),
+                               cursor: Optional[str] = None):
+    """
+    Stream content for a date range as newline-delimited JSON, most recent first.
+    
+    Args:
+        start_date: Start date in format "DD-MM-YYYY"
+        end_date: End date in format "DD-MM-YYYY"
+        limit: Optional page size
+        cursor: "date" of the last item of the previous page
+        
+    Returns:
+        application/x-ndjson stream with one content object per line
+    """
+    for value in (start_date, end_date, cursor):
+        if value is not None:
+            _validate_date(value)
+    
+    def _lines():
+        for content in iter_content_by_date_range(start_date, end_date, limit, cursor):
+            yield orjson.dumps(content) + b"\n"
+    
+    # Starlette iterates sync generators in its threadpool, keeping Firestore off the event loop
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
 
 @router.get("/content/{date}")
-async def get_content_by_date(date: str):
+async def get_content_by_date(date: str, request: Request):
     """
     Fetch all content (sections, cards, mindmap, pyq) for a specific date.
     
@@ -22,42 +114,106 @@ async def get_content_by_date(date: str):
     Returns:
         Dict containing sections, cards, mindmap, pyq, and metadata
     """
-    content = get_daily_content(date)
+    content = await asyncio.to_thread(get_daily_content, date)
     
     if content is None:
         raise HTTPException(status_code=404, detail=f"No content found for date: {date}")
     
-    return content
+    # updated_at changes on every save, so it identifies this version of the document
+    etag = _etag(f"{date}|{content.get('updated_at')}")
+    cache_control = _content_cache_control(date)
+    not_modified = _not_modified(request, etag, cache_control)
+    if not_modified:
+        return not_modified
+    
+    # The document is already JSON-native (timestamps are ISO strings), so hand it
+    # straight to orjson and skip FastAPI's pure-Python jsonable_encoder walk
+    return ORJSONResponse(content, headers={"ETag": etag, "Cache-Control": cache_control})
 
 
 @router.get("/dates")
-async def get_available_dates():
+async def get_available_dates(request: Request, response: Response,
+                              limit: Optional[int] = Query(None, ge=1, le=1000),
+                              cursor: Optional[str] = None):
     """
-    Get all available dates in the database.
+    Get available dates in the database, most recent first.
+    
+    Args:
+        limit: Optional page size; without it every date is returned
+        cursor: next_cursor from the previous page
+        
+    Returns:
+        List of date strings, plus next_cursor when paginating
+    """
+    if limit:
+        payload = await asyncio.to_thread(list_dates, limit, cursor)
+    else:
+        payload = {"dates": await asyncio.to_thread(get_all_dates)}
+    
+    etag = _etag(f"{cursor}|{limit}|" + ",".join(payload["dates"]))
+    not_modified = _not_modified(request, etag, DATES_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
     
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = DATES_CACHE_CONTROL
+    return payload
+
+
+@router.get("/summaries")
+async def get_content_summaries(limit: int = Query(30, ge=1, le=365)):
+    """
+    Get the most recent dates with their review summary, without the content itself.
+    
+    Args:
+        limit: Maximum number of dates to return
+        
     Returns:
-        List of date strings
+        List of summaries (date, overall_review, updated_at), most recent first
     """
-    dates = get_all_dates()
-    return {"dates": dates}
+    summaries = await asyncio.to_thread(list_summaries, limit)
+    return {"summaries": summaries}
 
 
-@router.post("/generate/{date}")
-async def generate_and_save_content(date: str, background_tasks: BackgroundTasks):
+@router.post("/generate/{date}", status_code=202)
+async def generate_and_save_content(date: str, background_tasks: BackgroundTasks,
+                                    review: Optional[bool] = None, force: bool = False):
     """
     Scrape, analyze, and generate all content for a date, then save to database.
     
     Args:
         date: Date string in format "DD-MM-YYYY" (e.g., "13-10-2025")
+        review: Run the review agents before saving (slower); defaults to ENABLE_REVIEW
+        force: Re-scrape, re-extract and regenerate, bypassing the article, section
+               and model response caches
         
     Returns:
-        Success message with date
+        Queued job status; poll /jobs/{date} until it is done, then fetch /content/{date}
     """
+    _validate_date(date)
+    
     try:
-        background_tasks.add_task(generate_and_save_content_task, date=date)
+        # In-process check first; the Firestore lock covers other replicas
+        job = jobs.get(date)
+        if job and job["status"] in ("queued", "running"):
+            return {"message": f"Generation already in progress for date {date}", **job}
+
+        jobs[date] = {"status": "queued", "date": date}
+        if not await asyncio.to_thread(acquire_generation_lock, date):
+            if job:
+                jobs[date] = job
+            else:
+                jobs.pop(date, None)
+            return {
+                "message": f"Generation already in progress for date {date} on another worker",
+                "status": "running",
+                "date": date,
+            }
+        background_tasks.add_task(_run_generation, date=date, review=review, force=force)
         
         return {
-            "message": f"Starting generation and saving content for date {date}"
+            "message": f"Starting generation and saving content for date {date}",
+            **jobs[date],
         }
         
     except HTTPException:
@@ -66,3 +222,26 @@ async def generate_and_save_content(date: str, background_tasks: BackgroundTasks
         raise HTTPException(status_code=500, detail=f"Error generating content: {str(e)}")
 
 
+
+
+@router.get("/jobs/{date}")
+async def get_job_status(date: str):
+    """
+    Get the status of the generation job for a date.
+    
+    Args:
+        date: Date string in format "DD-MM-YYYY" (e.g., "13-10-2025")
+        
+    Returns:
+        Job status: queued, running, done (with result counts) or failed (with error).
+        Dates generated earlier or by another worker report done without a result.
+    """
+    job = jobs.get(date)
+    
+    if job is None:
+        # No job in this process; an ID-only lookup tells whether content exists anyway
+        if await asyncio.to_thread(daily_content_exists, date):
+            return {"status": "done", "date": date}
+        raise HTTPException(status_code=404, detail=f"No generation job found for date: {date}")
+    
+    return job
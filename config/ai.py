@@ -1,4 +1,5 @@
 from google import genai
+from google.genai import types
 from dotenv import load_dotenv
 import os
 
@@ -6,4 +7,22 @@ load_dotenv()
 
 
 api_key = os.getenv("GEMINI_API_KEY")
-client = genai.Client(api_key=api_key)
+
+# Model used by each agent: section extraction and question writing get the
+# stronger flash model, structured card/mindmap generation and JSON review
+# edits run on flash-lite
+MODEL_FOR = {
+    "analyse": "gemini-2.0-flash",
+    "cards": "gemini-2.0-flash-lite",
+    "mindmap": "gemini-2.0-flash-lite",
+    "pyq": "gemini-2.0-flash",
+    "review": "gemini-2.0-flash-lite",
+    "batch": "gemini-2.0-flash",
+}
+
+# The client keeps one connection pool for the process, so concurrent agent
+# calls already reuse connections; the pinned SDK doesn't accept a custom httpx client
+client = genai.Client(
+    api_key=api_key,
+    http_options=types.HttpOptions(timeout=120_000),
+)
@@ -1,18 +1,58 @@
+import asyncio
+import logging
+import queue
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import os
 from dotenv import load_dotenv
 from api.content import router as content_router
+from scrap.scrap import SESSION as scrape_session
+from services.db_service import warm_up_connection
 import uvicorn
 
 # Load environment variables
 load_dotenv()
 
+# Request threads only enqueue log records; a listener thread does the stderr writes
+_log_queue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+# QueueHandler.prepare() bakes its formatter's output into record.msg; keep it to
+# the bare message so only the listener's handler adds the prefix
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    handlers=[_queue_handler],
+    # "python main.py" imports this module twice (as __main__ and as main);
+    # the app's own queue must win since its lifespan starts the listener
+    force=True,
+)
+log_listener = QueueListener(_log_queue, _log_handler)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    log_listener.start()
+    # Open the Firestore channel before the first request arrives
+    await asyncio.to_thread(warm_up_connection)
+    yield
+    # Close pooled scraper connections on shutdown
+    scrape_session.close()
+    log_listener.stop()
+
+
 # Create FastAPI instance
 app = FastAPI(
     title="DailySync UPSC",
     description="DailySync UPSC is a platform for UPSC aspirants to prepare for the UPSC exam.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    # Serialize large content payloads with orjson instead of the stdlib encoder
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -47,5 +87,15 @@ async def health_check():
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True)
+    # Auto-reload is for local development only; set RELOAD=1 to enable it
+    reload = os.getenv("RELOAD", "0") == "1"
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        reload=reload,
+        workers=int(os.getenv("WORKERS", 1)),
+        loop="uvloop",
+        http="httptools",
+    )
 
@@ -55,6 +55,18 @@ Your role:
 7. Improve clarity and quality without changing meaning
 8. Maintain section relationships and metadata
 
+Your output must ALWAYS be valid JSON only — no explanations, no notes, no Markdown.
+""",
+"all_content": """
+You are an expert at converting daily current-affairs text into complete UPSC study material.
+
+For each content block you produce, in one response:
+1. Recall cards with title, GS paper tags, keyword tags, a 3-4 line summary and CTA buttons
+2. A hierarchical mind map (3 levels deep maximum)
+3. UPSC-style Prelims (MCQ) and Mains (descriptive) practice questions
+
+Keep every block's material strictly based on that block's content.
+
 Your output must ALWAYS be valid JSON only — no explanations, no notes, no Markdown.
 """
-}
\ No newline at end of file
+}
@@ -1,6 +1,17 @@
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import logging
 import os
+import re
+import time
+
+
+__all__ = ["scrape_article", "scrape_article_to_file", "scrape_all_articles", "SESSION"]
+
+logger = logging.getLogger(__name__)
 
 
 def get_project_root():
@@ -23,83 +34,154 @@ website_urls = {
     "indianexpress": "https://indianexpress.com/about/current-affairs/",
 }
 
-def scrape_article(url: str, output_file: str):
-    try:
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
-    except Exception as e:
-        print(f"Error fetching URL: {e}")
-        return
+SCRAPE_CACHE_TTL = 24 * 60 * 60  # seconds
+
+# Stands in for an empty body, e.g. the page drishti serves for a date not yet published
+NO_CONTENT = "No content found"
+
+# Content container candidates, most specific first
+CONTENT_SELECTORS = (
+    "div.entry-content",
+    "div.post-content",
+    "div.article-content",
+    "article",
+    "div.content",
+    "div#content",
+)
 
-    soup = BeautifulSoup(resp.text, "html.parser")
+# Matches the text node carrying the "N min read" part of the meta line
+MIN_READ_RE = re.compile("min read")
 
-    # Extract Title
+HEADING_TAGS = frozenset(("h2", "h3", "h4", "h5", "h6"))
+
+# Shared session so repeat scrapes reuse TCP/TLS connections; transient
+# connection errors and 5xx responses are retried with backoff
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+
+def _build_article_text(soup: BeautifulSoup) -> str:
+    """
+    Build the article text (title, meta line and content) from a parsed page.
+
+    Args:
+        soup: Parsed article page
+
+    Returns:
+        Article text; NO_CONTENT stands in for an empty body
+    """
+    # Extract Title (any h1 wins over div.entry-title)
     title = None
-    title_selectors = [
-        soup.find("h1"),
-        soup.find("h1", class_="entry-title"),
-        soup.find("h1", class_="post-title"),
-        soup.find("div", class_="entry-title"),
-    ]
-    for selector in title_selectors:
-        if selector:
-            title = selector.get_text(strip=True)
-            break
+    title_el = soup.find("h1") or soup.select_one("div.entry-title")
+    if title_el:
+        title = title_el.get_text(strip=True)
 
     # Extract Meta Line (Date + min read)
     meta_line = None
-    meta_div = soup.find(lambda tag: tag.name == "div" and "min read" in tag.get_text())
+    # The meta div holds the date, read time and breadcrumbs as separate
+    # children, so find the "min read" text node and take its outermost div
+    # (the first div whose text contains it, in document order)
+    meta_div = None
+    min_read = soup.find(string=MIN_READ_RE)
+    if min_read:
+        for parent in min_read.parents:
+            if parent.name == "div":
+                meta_div = parent
     if meta_div:
         meta_line = meta_div.get_text(strip=True)
 
     # Extract Content
-    content = ""
-    content_selectors = [
-        soup.find("div", class_="entry-content"),
-        soup.find("div", class_="post-content"),
-        soup.find("div", class_="article-content"),
-        soup.find("article"),
-        soup.find("div", class_="content"),
-        soup.find("div", id="content"),
-    ]
-
     content_elements = []
-    content_container = None
 
-    for selector in content_selectors:
-        if selector:
-            content_container = selector
-            break
-
-    if not content_container:
-        content_container = soup.find("body")
+    # Probe selectors lazily in priority order and stop at the first match
+    content_container = next(
+        (el for el in map(soup.select_one, CONTENT_SELECTORS) if el), None
+    ) or soup.body
 
     if content_container:
-        for element in content_container.find_all(
-            ["p", "ul", "ol", "h2", "h3", "h4", "h5", "h6"],
-            recursive=True
-        ):
-            if element.name in ["ul", "ol"]:
-                list_items = []
-                for li in element.find_all("li", recursive=False):
-                    text = li.get_text(strip=True)
-                    if text:
-                        list_items.append(f"• {text}")
-                if list_items:
-                    content_elements.append("\n".join(list_items))
+        # One walk over the subtree, dispatching on tag name
+        for element in content_container.descendants:
+            if not isinstance(element, Tag):
+                continue
+            name = element.name
 
-            elif element.name in ["h2", "h3", "h4", "h5", "h6"]:
+            if name == "p":
+                text = element.get_text(strip=True)
+                if text and len(text) > 20:
+                    content_elements.append(text)
+
+            elif name in HEADING_TAGS:
                 text = element.get_text(strip=True)
                 if text:
                     content_elements.append(f"\n{text}\n")
 
-            elif element.name == "p":
-                text = element.get_text(strip=True)
-                if text and len(text) > 20:
-                    content_elements.append(text)
+            elif name == "ul" or name == "ol":
+                item_texts = (li.get_text(strip=True) for li in element.find_all("li", recursive=False))
+                list_items = "\n".join(f"• {text}" for text in item_texts if text)
+                if list_items:
+                    content_elements.append(list_items)
 
     content = "\n\n".join(content_elements)
 
+    parts = []
+    if title:
+        parts.append(title + "\n")
+    if meta_line:
+        parts.append(meta_line + "\n")
+    parts.append("\n" + content if content else NO_CONTENT)
+    article_text = "".join(parts)
+
+    logger.debug("Title: %s", title)
+    logger.debug("Content length: %d characters", len(content))
+
+    return article_text
+
+
+def scrape_article(url: str, session: requests.Session = SESSION):
+    """
+    Scrape an article page and return its text.
+
+    Args:
+        url: Article URL
+        session: HTTP session to fetch with (shared module session by default)
+
+    Returns:
+        Article text, or None if the fetch failed
+    """
+    try:
+        resp = session.get(url, timeout=10)
+        resp.raise_for_status()
+    except Exception as e:
+        logger.warning("Error fetching URL %s: %s", url, e)
+        return None
+
+    # Pass raw bytes so lxml detects the page encoding itself
+    soup = BeautifulSoup(resp.content, "lxml")
+    return _build_article_text(soup)
+
+
+def scrape_article_to_file(url: str, output_file: str, session: requests.Session = SESSION):
+    """
+    Scrape an article page and save its text under the data directory.
+
+    Args:
+        url: Article URL
+        output_file: File name under the data directory
+        session: HTTP session to fetch with (shared module session by default)
+
+    Returns:
+        Path of the written file, or None if scraping or writing failed
+    """
+    article_text = scrape_article(url, session)
+    if article_text is None:
+        return None
+
     # Write to output file
     try:
         data_dir = get_data_dir()
@@ -109,48 +191,85 @@ def scrape_article(url: str, output_file: str):
         output_file_path = os.path.normpath(output_file_path)
         
         with open(output_file_path, "w", encoding="utf-8") as f:
-            if title:
-                f.write(title + "\n")
-            if meta_line:
-                f.write(meta_line + "\n")
-            if content:
-                f.write("\n" + content)
-            else:
-                f.write("No content found")
+            f.write(article_text)
     except Exception as e:
-        print(f"Error writing file: {e}")
+        logger.error("Error writing file: %s", e)
         return None
 
-    print(f"Content saved to: {output_file_path}")
-    print(f"Title: {title}")
-    print(f"Content length: {len(content)} characters")
+    logger.info("Content saved to: %s", output_file_path)
 
     return output_file_path
 
 
-def scrape_all_articles(date: str):
-    articles = []
-    for website, url in website_urls.items():
-        output_file = scrape_article(url=url + date, output_file=f"{date}_{website}.txt")
-        
-        # Check if scrape_article returned a valid file path
-        if output_file is None:
-            print(f"Warning: Failed to scrape {website} for date {date}")
-            continue
-        
-        # Check if file exists before trying to read it
-        if not os.path.exists(output_file):
-            print(f"Warning: File not found: {output_file}")
-            continue
-        
+def _is_placeholder(article_text: str) -> bool:
+    """Whether a scraped article has no body, e.g. a page not published yet."""
+    return article_text.endswith(NO_CONTENT)
+
+
+def _load_cached_article(cache_file: str):
+    """Return a scraped article saved under the data directory if it is younger than the TTL."""
+    try:
+        if time.time() - os.path.getmtime(cache_file) >= SCRAPE_CACHE_TTL:
+            return None
+        with open(cache_file, "r", encoding="utf-8") as f:
+            article_text = f.read()
+    except OSError:
+        return None
+    # Placeholders written before they were excluded from the cache
+    return None if _is_placeholder(article_text) else article_text
+
+
+def _scrape_site(url: str, cache_file: str, use_cache: bool):
+    """Scrape one site, serving and refreshing the per-(date, site) file cache."""
+    if use_cache:
+        cached = _load_cached_article(cache_file)
+        if cached is not None:
+            logger.info("Using cached article: %s", cache_file)
+            return cached
+
+    content = scrape_article(url, SESSION)
+    # Don't cache an empty page; the date may be published later today
+    if content is not None and not _is_placeholder(content):
         try:
-            with open(output_file, "r", encoding="utf-8") as f:
-                content = f.read()
-            articles.append(content)
-        except Exception as e:
-            print(f"Error reading file {output_file}: {e}")
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(cache_file, "w", encoding="utf-8") as f:
+                f.write(content)
+        except OSError as e:
+            logger.warning("Error writing file: %s", e)
+    return content
+
+
+def scrape_all_articles(date: str, use_cache: bool = True):
+    """
+    Scrape every site for a date and join the articles.
+
+    Args:
+        date: Date string in format "DD-MM-YYYY"
+        use_cache: Reuse data/{date}_{site}.txt if it was scraped within SCRAPE_CACHE_TTL
+
+    Returns:
+        Articles joined by newlines, in website_urls order
+    """
+    data_dir = get_data_dir()
+
+    # Fetch every site in parallel; results stay in website_urls order
+    with ThreadPoolExecutor(max_workers=len(website_urls)) as executor:
+        futures = {
+            website: executor.submit(
+                _scrape_site, url + date, os.path.join(data_dir, f"{date}_{website}.txt"), use_cache
+            )
+            for website, url in website_urls.items()
+        }
+
+    articles = []
+    for website, future in futures.items():
+        content = future.result()
+
+        if content is None:
+            logger.warning("Failed to scrape %s for date %s", website, date)
             continue
-        # os.remove(output_file)
+
+        articles.append(content)
 
     if not articles:
         raise Exception(f"No articles were successfully scraped for date {date}")
@@ -159,11 +278,11 @@ def scrape_all_articles(date: str):
     return final_content
 
 
-# scrape_article(
+# scrape_article_to_file(
 #     url="https://indianexpress.com/about/current-affairs/",
 #     output_file="indianexpress.txt"
 # )
-# scrape_article(
+# scrape_article_to_file(
 #     url="https://www.drishtiias.com/current-affairs-news-analysis-editorials/news-analysis/19-11-2025",
 #     output_file="14ssontent.txt"
 # )
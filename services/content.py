@@ -1,110 +1,329 @@
+import asyncio
+import hashlib
+import logging
+import orjson
+import os
+import re
 import time
-from scrap.scrap import scrape_article, scrape_all_articles
-from agents.cards import create_cards
-from agents.mindmap import create_mindmap
-from agents.pyq import create_pyq
+from typing import Optional
+import httpx
+from google.genai import errors as genai_errors
+from tenacity import (
+    AsyncRetrying,
+    before_sleep_log,
+    retry,
+    retry_if_exception_type,
+    retry_if_result,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+from scrap.scrap import scrape_all_articles
+from agents.cards import create_cards, create_cards_batch
+from agents.mindmap import create_mindmap, create_mindmap_batch
+from agents.pyq import create_pyq, create_pyq_batch
 from agents.analyse import extract_sections
+from agents.batch import MAX_SECTIONS_PER_CALL, generate_all
 from agents.review import review_all_content
 from services.db_service import save_daily_content
+from utils.utils import run_blocking
 
 
-MAX_RETRIES = 3
-RETRY_DELAY = 5  # seconds
+__all__ = ["generate_and_save_content"]
 
+logger = logging.getLogger(__name__)
 
-def generate_and_save_content(date: str):
+MAX_RETRIES = 3  # attempts per pipeline step
+RETRY_MIN_WAIT = 2  # seconds
+RETRY_MAX_WAIT = 20  # seconds
+MAX_CONCURRENT_LLM_CALLS = 8  # keep within Gemini rate limits
+
+# Review adds a second round of model calls, so it stays off unless enabled
+ENABLE_REVIEW = os.getenv("ENABLE_REVIEW", "0") == "1"
+
+EXTRACTION_CACHE_TTL = 24 * 60 * 60  # seconds
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+cache_dir = os.path.join(project_root, "cache")
+
+_llm_semaphore = asyncio.Semaphore(MAX_CONCURRENT_LLM_CALLS)
+
+
+# Model calls fail transiently on rate limits, server errors, dropped
+# connections and the occasional malformed JSON reply
+_TRANSIENT_LLM_ERRORS = (genai_errors.APIError, httpx.HTTPError, ValueError)
+
+
+def _return_last_outcome(retry_state):
+    """Once retries run out, hand back the last result (or raise its exception)."""
+    return retry_state.outcome.result()
+
+
+# Shared by every step: a few attempts with jittered exponential backoff
+_RETRY_POLICY = {
+    "stop": stop_after_attempt(MAX_RETRIES),
+    "wait": wait_random_exponential(multiplier=1, min=RETRY_MIN_WAIT, max=RETRY_MAX_WAIT),
+    "before_sleep": before_sleep_log(logger, logging.WARNING),
+    "reraise": True,
+}
+
+
+def _step_retry(**kwargs):
+    """Retry a single pipeline step with jittered exponential backoff."""
+    return retry(**_RETRY_POLICY, **kwargs)
+
+
+def _load_cached_extraction(date: str):
+    """
+    Load the scraped article and extracted sections cached for a date.
+
+    Returns:
+        Tuple of (article, sections), or None if missing or older than the TTL
+    """
+    cache_file = os.path.join(cache_dir, f"{date}.json")
+    try:
+        if time.time() - os.path.getmtime(cache_file) >= EXTRACTION_CACHE_TTL:
+            return None
+        with open(cache_file, "rb") as f:
+            cached = orjson.loads(f.read())
+        return cached["article"], cached["sections"]
+    except (OSError, KeyError, orjson.JSONDecodeError):
+        return None
+
+
+def _save_cached_extraction(date: str, article: str, sections: list):
+    """Cache the scraped article and extracted sections for a date on disk."""
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(os.path.join(cache_dir, f"{date}.json"), "wb") as f:
+            f.write(orjson.dumps({"article": article, "sections": sections}))
+    except OSError as e:
+        logger.warning("Error writing extraction cache for date %s: %s", date, e)
+
+
+def _section_text(section: dict) -> str:
+    """Join a section's bullet points into a single text block."""
+    section_content = section.get("content", [])
+    if isinstance(section_content, list):
+        return "\n".join(section_content)
+    return str(section_content)
+
+
+def _dedupe_texts(section_texts: list):
+    """
+    Collapse sections whose normalized text is identical.
+
+    Returns:
+        Tuple of (unique_texts, slots) where slots[i] is the index into
+        unique_texts holding the text for section i
+    """
+    unique_texts = []
+    slots = []
+    seen = {}
+    for section_text in section_texts:
+        normalized = re.sub(r"\s+", " ", section_text.strip().lower())
+        key = hashlib.sha256(normalized.encode()).hexdigest()
+        if key not in seen:
+            seen[key] = len(unique_texts)
+            unique_texts.append(section_text)
+        slots.append(seen[key])
+    return unique_texts, slots
+
+
+async def _call_agent(agent, content: str, bypass_cache: bool):
+    """Run a blocking agent call on the worker pool, bounded by the LLM semaphore."""
+    async with _llm_semaphore:
+        return await run_blocking(agent, content=content, bypass_cache=bypass_cache)
+
+
+async def _generate_for_sections(batch_agent, agent, section_texts: list, bypass_cache: bool):
+    """
+    Run one agent over all sections with a single batched model call.
+
+    Falls back to concurrent per-section calls if the batched response
+    cannot be mapped back onto the sections.
+
+    Returns:
+        List of agent results, one per section, in input order
+    """
+    try:
+        async with _llm_semaphore:
+            return await run_blocking(batch_agent, contents=section_texts, bypass_cache=bypass_cache)
+    except ValueError as e:
+        logger.warning("Batched %s failed, falling back to per-section calls: %s", agent.__name__, e)
+        return await asyncio.gather(
+            *(_call_agent(agent, section_text, bypass_cache) for section_text in section_texts)
+        )
+
+
+async def _generate_chunk(section_texts: list, bypass_cache: bool):
+    """
+    Generate cards, mindmaps and PYQs for a chunk of sections with one model call.
+
+    Falls back to one batched call per agent if the combined response
+    cannot be mapped back onto the sections.
+
+    Returns:
+        Tuple of (cards, mindmaps, pyqs) lists, one entry per section
+    """
+    try:
+        async with _llm_semaphore:
+            generated = await run_blocking(generate_all, section_texts=section_texts, bypass_cache=bypass_cache)
+        return generated["cards"], generated["mindmaps"], generated["pyqs"]
+    except ValueError as e:
+        logger.warning("Combined generation failed, falling back to per-agent calls: %s", e)
+        return await asyncio.gather(
+            _generate_for_sections(create_cards_batch, create_cards, section_texts, bypass_cache),
+            _generate_for_sections(create_mindmap_batch, create_mindmap, section_texts, bypass_cache),
+            _generate_for_sections(create_pyq_batch, create_pyq, section_texts, bypass_cache),
+        )
+
+
+@_step_retry(retry=retry_if_exception_type(_TRANSIENT_LLM_ERRORS))
+async def _generate_all_sections(section_texts: list, bypass_cache: bool = False):
+    """
+    Generate cards, mindmaps and PYQs for all sections.
+
+    Sections go MAX_SECTIONS_PER_CALL to a combined call so no reply runs
+    past the model's output limit; the chunks run concurrently.
+
+    Returns:
+        Tuple of (cards, mindmaps, pyqs) lists, one entry per section
+    """
+    chunks = [
+        section_texts[start:start + MAX_SECTIONS_PER_CALL]
+        for start in range(0, len(section_texts), MAX_SECTIONS_PER_CALL)
+    ]
+    cards, mindmaps, pyqs = [], [], []
+    for chunk_cards, chunk_mindmaps, chunk_pyqs in await asyncio.gather(
+        *(_generate_chunk(chunk, bypass_cache) for chunk in chunks)
+    ):
+        cards.extend(chunk_cards)
+        mindmaps.extend(chunk_mindmaps)
+        pyqs.extend(chunk_pyqs)
+    return cards, mindmaps, pyqs
+
+
+@_step_retry(retry=retry_if_exception_type(Exception))
+async def _scrape(date: str, use_cache: bool) -> str:
+    """Scrape all articles for a date; scraping raises a bare Exception when every site fails."""
+    return await run_blocking(scrape_all_articles, date=date, use_cache=use_cache)
+
+
+async def _extract_sections(article: str, bypass_cache: bool = False) -> list:
+    """
+    Extract sections from the article, retrying when none come back.
+
+    Retries skip the response cache so the model is actually asked again
+    instead of replaying the reply that came back empty.
+    """
+    sections = []
+    async for attempt in AsyncRetrying(
+        retry=retry_if_exception_type(_TRANSIENT_LLM_ERRORS) | retry_if_result(lambda result: not result),
+        retry_error_callback=_return_last_outcome,
+        **_RETRY_POLICY,
+    ):
+        with attempt:
+            sections = await run_blocking(
+                extract_sections,
+                article_text=article,
+                bypass_cache=bypass_cache or attempt.retry_state.attempt_number > 1,
+            )
+        if not attempt.retry_state.outcome.failed:
+            attempt.retry_state.set_result(sections)
+    return sections
+
+
+@_step_retry(retry=retry_if_exception_type(_TRANSIENT_LLM_ERRORS))
+async def _review(sections: list, cards: list, mindmaps: list, pyq: dict, article: str) -> dict:
+    """Run the review agents over the generated content."""
+    return await review_all_content(
+        sections=sections,
+        cards=cards,
+        mindmaps=mindmaps,
+        pyq=pyq,
+        original_text=article,
+    )
+
+
+@_step_retry(retry=retry_if_result(lambda success: not success), retry_error_callback=_return_last_outcome)
+async def _save(**content) -> bool:
+    """Save the content; save_daily_content reports failure by returning False."""
+    return await run_blocking(save_daily_content, **content)
+
+
+async def generate_and_save_content(date: str, review: Optional[bool] = None, force: bool = False):
     """
     Scrape, analyze, and generate all content for a date, then save to database.
 
     Args:
         date: Date string in format "DD-MM-YYYY" (e.g., "13-10-2025")
+        review: Run the review agents over the generated content before saving;
+                None uses the ENABLE_REVIEW setting
+        force: Re-scrape, re-extract and regenerate even if fresh cached articles,
+               sections or model responses exist
 
     Returns:
         Dict with success status and content counts, or None on failure
     """
-    for attempt in range(MAX_RETRIES):
-        try:
+    if review is None:
+        review = ENABLE_REVIEW
+
+    # Each step retries on its own, so a late failure never re-runs earlier steps
+    try:
+        cached = None if force else _load_cached_extraction(date)
+        if cached:
+            logger.info("Using cached article and sections for date %s", date)
+            article, sections = cached
+        else:
             # Step 1: Scrape articles
-            print(f"Scraping articles for date {date}...")
-            article = scrape_all_articles(date=date)
+            logger.info("Scraping articles for date %s", date)
+            article = await _scrape(date, use_cache=not force)
 
             # Step 2: Extract sections
-            print(f"Extracting sections for date {date}...")
-            sections = extract_sections(article_text=article)
+            logger.info("Extracting sections for date %s", date)
+            sections = await _extract_sections(article, bypass_cache=force)
 
             if not sections:
-                print(f"No sections extracted from article for date {date}")
-                if attempt < MAX_RETRIES - 1:
-                    time.sleep(RETRY_DELAY)
-                    continue
+                logger.warning("No sections extracted from article for date %s", date)
                 return None
 
-            # Step 3: Generate content for each section
-            print(f"Generating content for each section for date {date}...")
-            all_cards = []
-            all_mindmaps = []
-            all_pyqs = {"prelims": [], "mains": []}
-
-            for section_index, section in enumerate(sections):
-                # Get section content (it's an array, so join it)
-                section_content = section.get("content", [])
-                if isinstance(section_content, list):
-                    section_text = "\n".join(section_content)
-                else:
-                    section_text = str(section_content)
-
-                # Get section title for reference
-                section_title = section.get("title", f"Section {section_index + 1}")
-
-                # Generate cards with section reference
-                print(
-                    f"Generating cards for section {section_title} for date {date}..."
-                )
-                section_cards = create_cards(content=section_text)
-                if isinstance(section_cards, list):
-                    for card in section_cards:
-                        if isinstance(card, dict):
-                            card["section_index"] = section_index
-                            card["section_title"] = section_title
-                    all_cards.extend(section_cards)
-
-                # Generate mindmap with section reference
-                print(
-                    f"Generating mindmap for section {section_title} for date {date}..."
+            _save_cached_extraction(date, article, sections)
+
+        # Step 3: Generate content for each section
+        logger.info("Generating content for each section for date %s", date)
+        section_texts = [_section_text(section) for section in sections]
+        unique_texts, slots = _dedupe_texts(section_texts)
+        cards_per_text, mindmaps, pyqs = await _generate_all_sections(unique_texts, bypass_cache=force)
+
+        # Tag items with their section through one dict merge each; merging
+        # builds new dicts, so sections sharing a deduplicated result stay independent
+        all_cards = []
+        all_mindmaps = []
+        all_pyqs = {"prelims": [], "mains": []}
+        for section_index, (section, slot) in enumerate(zip(sections, slots)):
+            section_meta = {
+                "section_index": section_index,
+                "section_title": section.get("title", f"Section {section_index + 1}"),
+            }
+            section_cards, mindmap, pyq = cards_per_text[slot], mindmaps[slot], pyqs[slot]
+
+            if isinstance(section_cards, list):
+                all_cards.extend(
+                    {**card, **section_meta} for card in section_cards if isinstance(card, dict)
                 )
-                mindmap = create_mindmap(content=section_text)
-                if isinstance(mindmap, dict):
-                    mindmap["section_index"] = section_index
-                    mindmap["section_title"] = section_title
-                all_mindmaps.append(mindmap)
-
-                # Generate PYQ with section reference
-                print(f"Generating PYQ for section {section_title} for date {date}...")
-                pyq = create_pyq(content=section_text)
-                if isinstance(pyq, dict):
-                    if "prelims" in pyq and isinstance(pyq["prelims"], list):
-                        for prelim_q in pyq["prelims"]:
-                            if isinstance(prelim_q, dict):
-                                prelim_q["section_index"] = section_index
-                                prelim_q["section_title"] = section_title
-                        all_pyqs["prelims"].extend(pyq["prelims"])
-                    if "mains" in pyq and isinstance(pyq["mains"], list):
-                        for mains_q in pyq["mains"]:
-                            if isinstance(mains_q, dict):
-                                mains_q["section_index"] = section_index
-                                mains_q["section_title"] = section_title
-                        all_pyqs["mains"].extend(pyq["mains"])
-
-            # Step 4: Review and correct all content
-            print(f"Reviewing content for date {date}...")
-            print(f"Reviewing sections for date {date}...")
-            review_results = review_all_content(
-                sections=sections,
-                cards=all_cards,
-                mindmaps=all_mindmaps,
-                pyq=all_pyqs,
-                original_text=article,
-            )
+            all_mindmaps.append({**mindmap, **section_meta} if isinstance(mindmap, dict) else mindmap)
+            if isinstance(pyq, dict):
+                for kind in ("prelims", "mains"):
+                    all_pyqs[kind].extend(
+                        {**question, **section_meta}
+                        for question in pyq.get(kind) or []
+                        if isinstance(question, dict)
+                    )
+
+        # Step 4: Optionally review and correct all content
+        if review:
+            logger.info("Reviewing content for date %s", date)
+            review_results = await _review(sections, all_cards, all_mindmaps, all_pyqs, article)
 
             # Extract corrected content
             corrected_sections = review_results["sections"]["corrected_sections"]
@@ -116,51 +335,48 @@ def generate_and_save_content(date: str):
 
             # Log review summary
             overall_review = review_results["overall_review"]
-            print(
-                f"Review completed: {overall_review['total_issues']} issues found, "
-                f"{overall_review['total_corrections']} corrections made, "
-                f"accuracy: {overall_review['average_accuracy']:.2%}"
-            )
-
-            # Step 5: Save corrected content to database
-            success = save_daily_content(
-                date=date,
-                sections=corrected_sections,
-                cards=corrected_cards,
-                mindmap={"mindmaps": corrected_mindmaps},
-                pyq=corrected_pyq,
-                overall_review=overall_review,
+            logger.info(
+                "Review completed: %d issues found, %d corrections made, accuracy: %.2f%%",
+                overall_review["total_issues"],
+                overall_review["total_corrections"],
+                overall_review["average_accuracy"] * 100,
             )
+        else:
+            corrected_sections = sections
+            corrected_cards = all_cards
+            corrected_mindmaps = all_mindmaps
+            corrected_pyq = all_pyqs
+            overall_review = None
 
-            if not success:
-                print(f"Failed to save content to database for date {date}")
-                if attempt < MAX_RETRIES - 1:
-                    time.sleep(RETRY_DELAY)
-                    continue
-                return None
-
-            return {
-                "message": "Content generated and saved successfully",
-                "date": date,
-                "sections_count": len(corrected_sections),
-                "cards_count": len(corrected_cards),
-                "mindmaps_count": len(corrected_mindmaps),
-                "prelims_count": len(corrected_pyq.get("prelims", [])),
-                "mains_count": len(corrected_pyq.get("mains", [])),
-                "review_summary": {
-                    "total_issues": overall_review["total_issues"],
-                    "total_corrections": overall_review["total_corrections"],
-                    "average_accuracy": overall_review["average_accuracy"],
-                },
-            }
+        # Step 5: Save corrected content to database
+        success = await _save(
+            date=date,
+            sections=corrected_sections,
+            cards=corrected_cards,
+            mindmap={"mindmaps": corrected_mindmaps},
+            pyq=corrected_pyq,
+            overall_review=overall_review,
+        )
 
-        except Exception as e:
-            print(
-                f"Error generating content for date {date} (attempt {attempt + 1}/{MAX_RETRIES}): {str(e)}"
-            )
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(RETRY_DELAY)
-                continue
+        if not success:
+            logger.error("Failed to save content to database for date %s", date)
             return None
 
-    return None
+        return {
+            "message": "Content generated and saved successfully",
+            "date": date,
+            "sections_count": len(corrected_sections),
+            "cards_count": len(corrected_cards),
+            "mindmaps_count": len(corrected_mindmaps),
+            "prelims_count": len(corrected_pyq.get("prelims", [])),
+            "mains_count": len(corrected_pyq.get("mains", [])),
+            "review_summary": {
+                "total_issues": overall_review["total_issues"],
+                "total_corrections": overall_review["total_corrections"],
+                "average_accuracy": overall_review["average_accuracy"],
+            } if overall_review else None,
+        }
+
+    except Exception:
+        logger.exception("Error generating content for date %s", date)
+        return None
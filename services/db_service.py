@@ -1,10 +1,206 @@
-from datetime import datetime
-from typing import Dict, List, Optional
+import logging
+import orjson
+import os
+import threading
+import zlib
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
+import diskcache
+from cachetools import TLRUCache, TTLCache
+from google.cloud import firestore
+from google.cloud.firestore_v1.base_query import FieldFilter
+from google.cloud.firestore_v1.field_path import FieldPath
 from config.db import db
 
 
+logger = logging.getLogger(__name__)
+
+# Resolved once at import instead of on every call
+_COL = db.collection("daily_content")
+_LOCKS = db.collection("locks")
+_DOC_ID = FieldPath.document_id()
+
+# Firestore caps a write batch at 500 operations
+BATCH_WRITE_LIMIT = 500
+
+# Large text-heavy fields are stored as zlib-compressed JSON under "<field>_gz"
+COMPRESSED_FIELDS = ("sections", "cards", "mindmap")
+COMPRESSION_LEVEL = 6
+
+# Ranges up to this many days are fetched by ID (cache first, one batch get for
+# the rest) instead of a range query
+MAX_BATCH_RANGE_DAYS = 31
+
+# Document IDs fetched per page when listing dates
+DATES_PAGE_SIZE = 1000
+
+# A generation lock older than this is treated as abandoned (crashed worker)
+GENERATION_LOCK_TTL = 30 * 60  # seconds
+
+# Past dates are effectively immutable; today's content can still be regenerated
+CURRENT_CONTENT_TTL = 60  # seconds
+PAST_CONTENT_TTL = 24 * 60 * 60  # seconds
+DATES_CACHE_TTL = 30  # seconds
+
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+content_cache_dir = os.getenv("CONTENT_CACHE_DIR", os.path.join(project_root, "cache", "content"))
+
+
+def _is_past(date: str) -> bool:
+    """Whether a "DD-MM-YYYY" date is before today (and so no longer regenerated)."""
+    try:
+        return datetime.strptime(date, "%d-%m-%Y").date() < datetime.now().date()
+    except ValueError:
+        return False
+
+
+def _content_ttu(date: str, value, now: float) -> float:
+    """Expiry time for a cached date: long for past dates, short for today and later."""
+    return now + (PAST_CONTENT_TTL if _is_past(date) else CURRENT_CONTENT_TTL)
+
+
+# In-process caches of fetched content (keyed by date) and the date list;
+# writes invalidate them
+_content_cache = TLRUCache(maxsize=512, ttu=_content_ttu)
+_dates_cache = TTLCache(maxsize=1, ttl=DATES_CACHE_TTL)
+_content_cache_lock = threading.Lock()
+
+# On-disk second level for past dates only, so restarts don't re-read
+# historical content from Firestore; diskcache is thread- and process-safe.
+# Entries expire like the in-process ones so a regeneration on another
+# replica or worker is picked up within PAST_CONTENT_TTL
+_disk_cache = diskcache.Cache(content_cache_dir)
+
+
+def _get_cached_content(date: str) -> Optional[Dict]:
+    """Look a date up in the in-process cache, then on disk (promoting disk hits)."""
+    with _content_cache_lock:
+        cached = _content_cache.get(date)
+    if cached is not None or not _is_past(date):
+        return cached
+    
+    try:
+        cached = _disk_cache.get(f"content:{date}")
+    except Exception:
+        logger.exception("Error reading content disk cache for date %s", date)
+        return None
+    if cached is not None:
+        with _content_cache_lock:
+            _content_cache[date] = cached
+    return cached
+
+
+def _set_cached_content(date: str, data: Dict):
+    """Cache a full, normalized document in process and, for past dates, on disk."""
+    with _content_cache_lock:
+        _content_cache[date] = data
+    if _is_past(date):
+        try:
+            _disk_cache.set(f"content:{date}", data, expire=PAST_CONTENT_TTL)
+        except Exception:
+            logger.exception("Error writing content disk cache for date %s", date)
+
+
+def warm_up_connection() -> None:
+    """
+    Open the Firestore gRPC channel with a one-ID read so the first request
+    doesn't pay for the TLS handshake and channel setup.
+    """
+    try:
+        list(_COL.select([_DOC_ID]).limit(1).stream())
+    except Exception:
+        logger.exception("Error warming up Firestore connection")
+
+
+def _to_iso(date: str) -> str:
+    """Convert a "DD-MM-YYYY" date to the "YYYY-MM-DD" form used as document ID."""
+    return datetime.strptime(date, "%d-%m-%Y").strftime("%Y-%m-%d")
+
+
+def _from_iso(doc_id: str) -> str:
+    """Convert a "YYYY-MM-DD" document ID back to the "DD-MM-YYYY" API date."""
+    return datetime.strptime(doc_id, "%Y-%m-%d").strftime("%d-%m-%Y")
+
+
+def _dates_from_docs(docs) -> List[str]:
+    """Convert document IDs to API dates, skipping (and logging) IDs that aren't "YYYY-MM-DD"."""
+    dates = []
+    for doc in docs:
+        try:
+            dates.append(_from_iso(doc.id))
+        except ValueError:
+            logger.warning("Skipping document with non-ISO ID %s; run migrate_document_ids()", doc.id)
+    return dates
+
+
+def _normalize_timestamps(data: Dict) -> Dict:
+    """Convert Firestore timestamps to ISO strings for JSON serialization, in place."""
+    for field in ("created_at", "updated_at"):
+        value = data.get(field)
+        if value is not None:
+            data[field] = value.isoformat()
+    return data
+
+
+def _decode_document(data: Dict) -> Dict:
+    """Decompress "<field>_gz" blobs back into their fields and normalize timestamps, in place."""
+    for field in COMPRESSED_FIELDS:
+        blob = data.pop(f"{field}_gz", None)
+        if blob is not None:
+            data[field] = orjson.loads(zlib.decompress(blob))
+    return _normalize_timestamps(data)
+
+
+def _stored_field_paths(fields: Optional[List[str]]) -> Optional[List[str]]:
+    """Map requested fields to stored ones; compressed fields also keep the plain name for older documents."""
+    if not fields:
+        return fields
+    stored = []
+    for field in fields:
+        if field in COMPRESSED_FIELDS:
+            stored.append(f"{field}_gz")
+        stored.append(field)
+    return stored
+
+
+def _invalidate_cached_content(*dates: str):
+    """Drop cached content for the given dates (in process and on disk), and the cached date list."""
+    with _content_cache_lock:
+        for date in dates:
+            _content_cache.pop(date, None)
+        _dates_cache.clear()
+    for date in dates:
+        try:
+            _disk_cache.delete(f"content:{date}")
+        except Exception:
+            logger.exception("Error invalidating content disk cache for date %s", date)
+
+
+def _build_payload(date: str, sections: List[Dict], cards: List[Dict], mindmap: Dict,
+                   pyq: Dict, overall_review: Optional[Dict], now: datetime) -> Dict:
+    """
+    Build the daily_content document; created_at and updated_at share one timestamp.
+    
+    Sections, cards and mindmap are stored compressed to cut storage and read
+    bandwidth; the plain fields are deleted so merged writes don't keep stale copies.
+    """
+    data = {
+        "date": date,
+        "pyq": pyq,
+        "overall_review": overall_review,
+        "created_at": now,
+        "updated_at": now
+    }
+    for field, value in (("sections", sections), ("cards", cards), ("mindmap", mindmap)):
+        data[f"{field}_gz"] = zlib.compress(orjson.dumps(value), COMPRESSION_LEVEL)
+        data[field] = firestore.DELETE_FIELD
+    return data
+
+
 def save_daily_content(date: str, sections: List[Dict], cards: List[Dict], 
-                       mindmap: Dict, pyq: Dict, overall_review: Dict) -> bool:
+                       mindmap: Dict, pyq: Dict, overall_review: Optional[Dict] = None) -> bool:
     """
     Save all daily content (sections, cards, mindmap, pyq) to Firestore.
     
@@ -14,67 +210,239 @@ def save_daily_content(date: str, sections: List[Dict], cards: List[Dict],
         cards: List of card dictionaries
         mindmap: Mindmap dictionary
         pyq: PYQ dictionary with prelims and mains
-        overall_review: Overall review dictionary
+        overall_review: Overall review dictionary, or None if review was skipped
     Returns:
         bool: True if successful, False otherwise
     """
     try:
-        # Convert date to document ID (use date as-is for easy querying)
-        doc_ref = db.collection("daily_content").document(date)
+        # ISO document IDs sort chronologically, so date ranges can be queried
+        # by ID; the human-readable date is kept in the "date" field
+        doc_ref = _COL.document(_to_iso(date))
         
         # Prepare document data
-        data = {
-            "date": date,
-            "sections": sections,
-            "cards": cards,
-            "mindmap": mindmap,
-            "pyq": pyq,
-            "overall_review": overall_review,
-            "created_at": datetime.now(),
-            "updated_at": datetime.now()
-        }
+        data = _build_payload(date, sections, cards, mindmap, pyq, overall_review, datetime.now())
         
         # Save to Firestore
         doc_ref.set(data, merge=True)
-        print(f"Successfully saved content for date: {date}")
+        _invalidate_cached_content(date)
+        logger.debug("Successfully saved content for date: %s", date)
         return True
         
-    except Exception as e:
-        print(f"Error saving content to database: {e}")
+    except Exception:
+        logger.exception("Error saving content to database for date %s", date)
         return False
 
 
-def get_daily_content(date: str) -> Optional[Dict]:
+def save_daily_contents(contents: List[Dict]) -> bool:
+    """
+    Save content for several dates using batched Firestore writes.
+    
+    Each batch commits up to BATCH_WRITE_LIMIT documents in one round trip,
+    which is what backfills and migrations need instead of one set() per date.
+    
+    Args:
+        contents: List of dicts with the save_daily_content arguments
+                  (date, sections, cards, mindmap, pyq, optional overall_review)
+        
+    Returns:
+        bool: True if every batch was committed, False otherwise
+    """
+    try:
+        items = iter(contents)
+        
+        while True:
+            chunk = list(islice(items, BATCH_WRITE_LIMIT))
+            if not chunk:
+                break
+            
+            batch = db.batch()
+            now = datetime.now()
+            for content in chunk:
+                data = _build_payload(
+                    content["date"], content["sections"], content["cards"],
+                    content["mindmap"], content["pyq"], content.get("overall_review"), now
+                )
+                batch.set(_COL.document(_to_iso(content["date"])), data, merge=True)
+            batch.commit()
+            _invalidate_cached_content(*(content["date"] for content in chunk))
+            logger.debug("Successfully saved content for %d dates", len(chunk))
+        
+        return True
+        
+    except Exception:
+        logger.exception("Error saving batched content to database")
+        return False
+
+
+def get_daily_content(date: str, fields: Optional[List[str]] = None) -> Optional[Dict]:
     """
     Fetch all daily content for a specific date.
     
     Args:
         date: Date string in format "DD-MM-YYYY" (e.g., "13-10-2025")
+        fields: Optional top-level fields to fetch instead of the whole document
         
     Returns:
-        Dict with sections, cards, mindmap, pyq or None if not found
+        Dict with sections, cards, mindmap, pyq (or just the requested fields)
+        or None if not found. Served from an in-process cache (a minute for
+        today, a day for past dates) backed by a disk cache for past dates;
+        treat as read-only.
     """
+    cached = _get_cached_content(date)
+    if cached is not None:
+        return {field: cached[field] for field in fields if field in cached} if fields else cached
+    
     try:
-        doc_ref = db.collection("daily_content").document(date)
-        doc = doc_ref.get()
+        doc_ref = _COL.document(_to_iso(date))
+        # Projected reads skip the large sections/cards payloads and aren't cached
+        doc = doc_ref.get(field_paths=_stored_field_paths(fields)) if fields else doc_ref.get()
         
         if doc.exists:
-            data = doc.to_dict()
-            # Convert Firestore timestamps to ISO strings for JSON serialization
-            if "created_at" in data and hasattr(data["created_at"], "isoformat"):
-                data["created_at"] = data["created_at"].isoformat()
-            if "updated_at" in data and hasattr(data["updated_at"], "isoformat"):
-                data["updated_at"] = data["updated_at"].isoformat()
+            data = _decode_document(doc.to_dict())
+            if not fields:
+                _set_cached_content(date, data)
             return data
         else:
-            print(f"No content found for date: {date}")
+            logger.debug("No content found for date: %s", date)
             return None
             
-    except Exception as e:
-        print(f"Error fetching content from database: {e}")
+    except Exception:
+        logger.exception("Error fetching content from database for date %s", date)
         return None
 
 
+def daily_content_exists(date: str) -> bool:
+    """
+    Check whether content exists for a date without downloading it.
+    
+    Args:
+        date: Date string in format "DD-MM-YYYY"
+        
+    Returns:
+        bool: True if a document exists (cached or in Firestore), False otherwise
+    """
+    if _get_cached_content(date) is not None:
+        return True
+    
+    try:
+        query = (
+            _COL
+            .where(filter=FieldFilter(_DOC_ID, "==", _COL.document(_to_iso(date))))
+            .select([_DOC_ID])
+            .limit(1)
+        )
+        return any(True for _ in query.stream())
+        
+    except Exception:
+        logger.exception("Error checking content existence for date %s", date)
+        return False
+
+
+def get_daily_contents(dates: List[str], field_paths: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """
+    Fetch daily content for several dates in a single BatchGetDocuments call.
+    
+    Dates already in the in-process or disk cache are served from it; only the
+    misses are requested from Firestore, and full documents fetched are cached.
+    
+    Args:
+        dates: Date strings in format "DD-MM-YYYY"
+        field_paths: Optional fields to project, to avoid pulling whole documents
+        
+    Returns:
+        Dict mapping each found date to its content; missing dates are omitted.
+        Treat as read-only, like get_daily_content.
+    """
+    results = {}
+    missing = []
+    for date in dict.fromkeys(dates):
+        cached = _get_cached_content(date)
+        if cached is None:
+            missing.append(date)
+        elif field_paths:
+            results[date] = {field: cached[field] for field in field_paths if field in cached}
+        else:
+            results[date] = cached
+    
+    if not missing:
+        return results
+    
+    try:
+        refs = [_COL.document(_to_iso(date)) for date in missing]
+        fetched = {}
+        
+        for doc in db.get_all(refs, field_paths=_stored_field_paths(field_paths)):
+            if doc.exists:
+                fetched[_from_iso(doc.id)] = _decode_document(doc.to_dict())
+        
+        if not field_paths:
+            for date, data in fetched.items():
+                _set_cached_content(date, data)
+        results.update(fetched)
+        return results
+        
+    except Exception:
+        logger.exception("Error fetching content for multiple dates from database")
+        return results
+
+
+def list_summaries(limit: int = 30) -> List[Dict]:
+    """
+    List the most recent dates with their review summary, without content payloads.
+    
+    Args:
+        limit: Maximum number of dates to return
+        
+    Returns:
+        List of dicts with date, overall_review and updated_at, most recent first
+    """
+    try:
+        query = (
+            _COL
+            .select(["date", "overall_review", "updated_at"])
+            .order_by(_DOC_ID, direction=firestore.Query.DESCENDING)
+            .limit(limit)
+        )
+        return [_normalize_timestamps(doc.to_dict()) for doc in query.stream()]
+        
+    except Exception:
+        logger.exception("Error fetching content summaries from database")
+        return []
+
+
+def list_dates(page_size: int = 50, start_after: Optional[str] = None) -> Dict:
+    """
+    Get one page of available dates, most recent first.
+    
+    Args:
+        page_size: Number of dates per page
+        start_after: Optional cursor returned as next_cursor by the previous page
+        
+    Returns:
+        Dict with "dates" and "next_cursor" (None on the last page)
+    """
+    try:
+        query = (
+            _COL
+            .select([_DOC_ID])
+            .order_by(_DOC_ID, direction=firestore.Query.DESCENDING)
+            .limit(page_size)
+        )
+        if start_after:
+            query = query.start_after([_COL.document(_to_iso(start_after))])
+        
+        docs = list(query.stream())
+        dates = _dates_from_docs(docs)
+        return {
+            "dates": dates,
+            "next_cursor": dates[-1] if dates and len(docs) == page_size else None
+        }
+        
+    except Exception:
+        logger.exception("Error fetching dates page from database")
+        return {"dates": [], "next_cursor": None}
+
+
 def get_all_dates() -> List[str]:
     """
     Get all available dates from the database.
@@ -82,49 +450,103 @@ def get_all_dates() -> List[str]:
     Returns:
         List of date strings
     """
+    with _content_cache_lock:
+        cached = _dates_cache.get("dates")
+    if cached is not None:
+        return cached
+    
     try:
-        docs = db.collection("daily_content").stream()
-        dates = [doc.id for doc in docs]
-        return sorted(dates, reverse=True)  # Most recent first
+        # Project only the document ID (an empty projection returns every field)
+        # and let Firestore sort, reading the collection a page at a time
+        query = (
+            _COL
+            .select([_DOC_ID])
+            .order_by(_DOC_ID, direction=firestore.Query.DESCENDING)
+            .limit(DATES_PAGE_SIZE)
+        )
+        dates = []
+        last_doc = None
+        
+        while True:
+            page = query.start_after(last_doc) if last_doc else query
+            docs = list(page.stream())
+            dates.extend(_dates_from_docs(docs))
+            if len(docs) < DATES_PAGE_SIZE:
+                break
+            last_doc = docs[-1]
         
-    except Exception as e:
-        print(f"Error fetching dates from database: {e}")
+        with _content_cache_lock:
+            _dates_cache["dates"] = dates
+        return dates  # Most recent first
+        
+    except Exception:
+        logger.exception("Error fetching dates from database")
         return []
 
 
-def get_content_by_date_range(start_date: str, end_date: str) -> List[Dict]:
+def iter_content_by_date_range(start_date: str, end_date: str, limit: Optional[int] = None,
+                               start_after: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Stream content for a date range, one document at a time.
+    
+    Args:
+        start_date: Start date in format "DD-MM-YYYY"
+        end_date: End date in format "DD-MM-YYYY"
+        limit: Optional page size
+        start_after: Optional cursor; the "date" of the last item of the previous page
+        
+    Yields:
+        Content dictionaries, most recent first. Unpaged ranges of up to
+        MAX_BATCH_RANGE_DAYS days go through the content cache; treat as read-only.
+    """
+    if limit is None and start_after is None:
+        try:
+            start = datetime.strptime(start_date, "%d-%m-%Y")
+            span = (datetime.strptime(end_date, "%d-%m-%Y") - start).days
+        except ValueError:
+            logger.exception("Invalid date range %s to %s", start_date, end_date)
+            return
+        if 0 <= span < MAX_BATCH_RANGE_DAYS:
+            # Short ranges: serve cached dates and batch-get the rest in one RPC
+            dates = [(start + timedelta(days=offset)).strftime("%d-%m-%Y") for offset in range(span, -1, -1)]
+            contents = get_daily_contents(dates)
+            yield from (contents[date] for date in dates if date in contents)
+            return
+    
+    try:
+        query = (
+            _COL
+            .where(filter=FieldFilter(_DOC_ID, ">=", _COL.document(_to_iso(start_date))))
+            .where(filter=FieldFilter(_DOC_ID, "<=", _COL.document(_to_iso(end_date))))
+            .order_by(_DOC_ID, direction=firestore.Query.DESCENDING)
+        )
+        if start_after:
+            query = query.start_after([_COL.document(_to_iso(start_after))])
+        if limit:
+            query = query.limit(limit)
+        
+        for doc in query.stream():
+            yield _decode_document(doc.to_dict())
+        
+    except Exception:
+        logger.exception("Error fetching content by date range")
+
+
+def get_content_by_date_range(start_date: str, end_date: str, limit: Optional[int] = None,
+                              start_after: Optional[str] = None) -> List[Dict]:
     """
     Fetch content for a date range.
     
     Args:
         start_date: Start date in format "DD-MM-YYYY"
         end_date: End date in format "DD-MM-YYYY"
+        limit: Optional page size
+        start_after: Optional cursor; the "date" of the last item of the previous page
         
     Returns:
-        List of content dictionaries
+        List of content dictionaries, most recent first; see iter_content_by_date_range
     """
-    try:
-        # Note: Firestore doesn't support range queries on document IDs directly
-        # You might need to add a date field for proper range queries
-        # For now, this fetches all and filters
-        docs = db.collection("daily_content").stream()
-        results = []
-        
-        for doc in docs:
-            doc_data = doc.to_dict()
-            doc_date = doc_data.get("date", doc.id)
-            if start_date <= doc_date <= end_date:
-                if "created_at" in doc_data and hasattr(doc_data["created_at"], "isoformat"):
-                    doc_data["created_at"] = doc_data["created_at"].isoformat()
-                if "updated_at" in doc_data and hasattr(doc_data["updated_at"], "isoformat"):
-                    doc_data["updated_at"] = doc_data["updated_at"].isoformat()
-                results.append(doc_data)
-        
-        return sorted(results, key=lambda x: x.get("date", ""), reverse=True)
-        
-    except Exception as e:
-        print(f"Error fetching content by date range: {e}")
-        return []
+    return list(iter_content_by_date_range(start_date, end_date, limit, start_after))
 
 
 def delete_daily_content(date: str) -> bool:
@@ -138,12 +560,96 @@ def delete_daily_content(date: str) -> bool:
         bool: True if successful, False otherwise
     """
     try:
-        doc_ref = db.collection("daily_content").document(date)
+        doc_ref = _COL.document(_to_iso(date))
         doc_ref.delete()
-        print(f"Successfully deleted content for date: {date}")
+        _invalidate_cached_content(date)
+        logger.debug("Successfully deleted content for date: %s", date)
         return True
         
-    except Exception as e:
-        print(f"Error deleting content from database: {e}")
+    except Exception:
+        logger.exception("Error deleting content from database for date %s", date)
         return False
 
+
+
+def acquire_generation_lock(date: str) -> bool:
+    """
+    Take the cross-process generation lock for a date.
+    
+    Uses a transaction on locks/{date} so only one replica generates a date
+    at a time; a lock older than GENERATION_LOCK_TTL is taken over.
+    
+    Args:
+        date: Date string in format "DD-MM-YYYY"
+        
+    Returns:
+        bool: True if the lock was acquired (or the lock store is unreachable),
+              False if another worker holds a fresh lock
+    """
+    lock_ref = _LOCKS.document(date)
+    
+    @firestore.transactional
+    def _acquire(transaction) -> bool:
+        snapshot = lock_ref.get(transaction=transaction)
+        if snapshot.exists:
+            locked_at = snapshot.get("locked_at")
+            if locked_at and (datetime.now(timezone.utc) - locked_at).total_seconds() < GENERATION_LOCK_TTL:
+                return False
+        transaction.set(lock_ref, {"date": date, "locked_at": firestore.SERVER_TIMESTAMP})
+        return True
+    
+    try:
+        return _acquire(db.transaction())
+    except Exception:
+        # Don't block generation on the lock store itself failing
+        logger.exception("Error acquiring generation lock for date %s", date)
+        return True
+
+
+def release_generation_lock(date: str) -> None:
+    """
+    Release the cross-process generation lock for a date.
+    
+    Args:
+        date: Date string in format "DD-MM-YYYY"
+    """
+    try:
+        _LOCKS.document(date).delete()
+    except Exception:
+        logger.exception("Error releasing generation lock for date %s", date)
+
+
+def migrate_document_ids() -> int:
+    """
+    One-off migration of legacy "DD-MM-YYYY" document IDs to "YYYY-MM-DD".
+    
+    Copies each legacy document under its ISO ID and deletes the original,
+    in write batches. Safe to re-run: already migrated IDs are skipped.
+    Run with: python -c "from services.db_service import migrate_document_ids; migrate_document_ids()"
+    
+    Returns:
+        Number of documents migrated
+    """
+    legacy_docs = []
+    for doc in _COL.stream():
+        try:
+            datetime.strptime(doc.id, "%d-%m-%Y")
+        except ValueError:
+            continue  # already ISO
+        legacy_docs.append(doc)
+    
+    # Each document is one set plus one delete
+    docs = iter(legacy_docs)
+    while True:
+        chunk = list(islice(docs, BATCH_WRITE_LIMIT // 2))
+        if not chunk:
+            break
+        batch = db.batch()
+        for doc in chunk:
+            batch.set(_COL.document(_to_iso(doc.id)), doc.to_dict())
+            batch.delete(doc.reference)
+        batch.commit()
+    
+    _invalidate_cached_content(*(doc.id for doc in legacy_docs))
+    logger.info("Migrated %d documents to ISO document IDs", len(legacy_docs))
+    return len(legacy_docs)
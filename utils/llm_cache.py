@@ -0,0 +1,110 @@
+import functools
+import hashlib
+import logging
+import orjson
+import os
+import sqlite3
+import threading
+import time
+
+from google.genai import types
+from pydantic import TypeAdapter
+from config.ai import client
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL = 7 * 24 * 60 * 60  # seconds
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+cache_path = os.getenv("LLM_CACHE_PATH", os.path.join(project_root, "llm_cache.db"))
+
+_local = threading.local()
+
+
+def _get_connection():
+    """Return this thread's SQLite connection, creating the cache table on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(cache_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, response TEXT, ts INTEGER)"
+        )
+        _local.conn = conn
+    return conn
+
+
+def _is_cacheable(raw_text: str) -> bool:
+    """Only keep non-empty JSON so malformed or empty replies are retried, not replayed."""
+    try:
+        value = orjson.loads(raw_text)
+    except orjson.JSONDecodeError:
+        return False
+    return bool(value) if isinstance(value, (list, dict)) else True
+
+
+@functools.lru_cache(maxsize=None)
+def _schema_fingerprint(response_schema) -> str:
+    """Serialize a response schema so schema changes invalidate cached responses."""
+    if response_schema is None:
+        return ""
+    return orjson.dumps(TypeAdapter(response_schema).json_schema()).decode()
+
+
+def cached_generate(model: str, system_instruction: str, prompt: str,
+                    response_mime_type: str = "application/json", response_schema=None,
+                    bypass_cache: bool = False) -> str:
+    """
+    Call Gemini through a persistent SQLite response cache.
+
+    Args:
+        model: Gemini model name
+        system_instruction: System instruction for the call
+        prompt: User prompt
+        response_mime_type: Response format requested from Gemini (JSON by default)
+        response_schema: Optional pydantic model (or list of one) the JSON must follow
+        bypass_cache: Skip the lookup and call the model; the fresh response is still stored
+
+    Returns:
+        Raw response text, served from the cache when a fresh entry exists
+    """
+    key = hashlib.sha256(
+        f"{model}|{response_mime_type}|{_schema_fingerprint(response_schema)}|"
+        f"{system_instruction}|{prompt}".encode()
+    ).hexdigest()
+
+    if not bypass_cache:
+        try:
+            row = _get_connection().execute(
+                "SELECT response, ts FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            # Entries written before empty replies were rejected may still hold them
+            if row and time.time() - row[1] < CACHE_TTL and _is_cacheable(row[0]):
+                return row[0]
+        except sqlite3.Error as e:
+            logger.warning("Error reading LLM cache: %s", e)
+
+    response = client.models.generate_content(
+        model=model,
+        config=types.GenerateContentConfig(
+            system_instruction=system_instruction,
+            response_mime_type=response_mime_type,
+            response_schema=response_schema,
+        ),
+        contents=prompt,
+    )
+    raw_text = response.text or ""
+
+    if _is_cacheable(raw_text):
+        try:
+            conn = _get_connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, response, ts) VALUES (?, ?, ?)",
+                    (key, raw_text, int(time.time())),
+                )
+        except sqlite3.Error as e:
+            logger.warning("Error writing LLM cache: %s", e)
+
+    return raw_text
@@ -1,8 +1,49 @@
-import re
-
-def extract_json_block(text: str) -> str:
-    """Extracts the first JSON block from the text."""
-    json_match = re.search(r'```json\s*(.*?)\s*```', text, re.DOTALL)
-    if json_match:
-        return json_match.group(1).strip()
-    return None
\ No newline at end of file
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Shared worker pool for blocking calls (LLM, scraping, Firestore) made from async code
+_executor = ThreadPoolExecutor(max_workers=16)
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Runs a blocking call on the shared worker pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+def format_batch_contents(contents: list) -> str:
+    """Formats several content blocks with [index] markers for a batch prompt."""
+    return "\n\n".join(
+        f"CONTENT [{index}]:\n{content}" for index, content in enumerate(contents)
+    )
+
+
+def unpack_batch_response(items, key: str, count: int) -> list:
+    """
+    Maps an indexed batch response back to input order.
+
+    Args:
+        items: Parsed model output, a list of {"index": i, key: ...} dicts
+        key: Name of the field holding each block's result
+        count: Number of content blocks sent in the prompt
+
+    Returns:
+        List of results, one per content block, in input order
+
+    Raises:
+        ValueError: If the response does not cover every index exactly once
+    """
+    if not isinstance(items, list) or len(items) != count:
+        raise ValueError(f"Expected {count} batch results, got {len(items) if isinstance(items, list) else 0}")
+
+    results = [None] * count
+    seen = set()
+    for item in items:
+        index = item.get("index") if isinstance(item, dict) else None
+        if not isinstance(index, int) or not 0 <= index < count or index in seen:
+            raise ValueError(f"Invalid or duplicate batch index: {index}")
+        seen.add(index)
+        results[index] = item.get(key)
+    return results